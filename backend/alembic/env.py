@@ -6,8 +6,7 @@ from alembic import context
 from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
-from app.core.config import settings
-from app.core.database import Base
+from app.core.database import Base, DATABASE_URL
 from app.models.database import SimulationHistory  # noqa: F401 - ensure models registered
 
 config = context.config
@@ -17,9 +16,8 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
-# Override URL from settings if available
-db_url = settings.DATABASE_URL or "sqlite+aiosqlite:///./qkd_simulator.db"
-config.set_main_option("sqlalchemy.url", db_url)
+# Migrate the same database the application connects to
+config.set_main_option("sqlalchemy.url", DATABASE_URL)
 
 
 def run_migrations_offline() -> None:
@@ -15,6 +15,11 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
+    # Databases set up before Alembic was adopted already have the table
+    # from metadata.create_all at startup; adopt it instead of failing
+    if sa.inspect(op.get_bind()).has_table('simulation_history'):
+        return
+
     op.create_table(
         'simulation_history',
         sa.Column('id', sa.String(36), primary_key=True),
@@ -0,0 +1,53 @@
+"""Store config/full_result as JSONB with a GIN index on PostgreSQL
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite keeps the plain JSON (text) columns
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in ('config', 'full_result'):
+        op.alter_column(
+            'simulation_history',
+            column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=False,
+            postgresql_using=f'{column}::jsonb',
+        )
+    op.create_index(
+        'ix_sim_history_full_result_gin',
+        'simulation_history',
+        ['full_result'],
+        postgresql_using='gin',
+        postgresql_ops={'full_result': 'jsonb_path_ops'},
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_sim_history_full_result_gin', table_name='simulation_history')
+    for column in ('config', 'full_result'):
+        op.alter_column(
+            'simulation_history',
+            column,
+            type_=sa.JSON(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::json',
+        )
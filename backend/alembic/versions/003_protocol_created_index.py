@@ -0,0 +1,37 @@
+"""Replace the protocol index with a composite (protocol, created_at DESC) index
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite index serves protocol-only lookups as well, so the
+    # single-column protocol index is redundant. created_at stays indexed
+    # for unfiltered history scans. IF [NOT] EXISTS keeps this safe on
+    # schemas that metadata.create_all built from a newer model.
+    op.drop_index(
+        'ix_simulation_history_protocol',
+        table_name='simulation_history',
+        if_exists=True,
+    )
+    op.create_index(
+        'ix_sim_history_protocol_created',
+        'simulation_history',
+        ['protocol', sa.text('created_at DESC')],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sim_history_protocol_created', table_name='simulation_history')
+    op.create_index('ix_simulation_history_protocol', 'simulation_history', ['protocol'])
@@ -0,0 +1,39 @@
+"""Add composite indexes for the is_secure / eve_attack history filters
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Each filter + ORDER BY created_at DESC LIMIT n becomes an index range
+    # scan. On PostgreSQL the INCLUDE columns let the other filters be
+    # checked from the index without visiting the heap.
+    op.create_index(
+        'ix_sim_history_secure_created',
+        'simulation_history',
+        ['is_secure', sa.text('created_at DESC')],
+        postgresql_include=['protocol', 'eve_attack', 'qber'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_sim_history_eve_created',
+        'simulation_history',
+        ['eve_attack', sa.text('created_at DESC')],
+        postgresql_include=['protocol', 'is_secure', 'qber'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sim_history_eve_created', table_name='simulation_history')
+    op.drop_index('ix_sim_history_secure_created', table_name='simulation_history')
@@ -0,0 +1,27 @@
+"""
+Compiled numerical kernels for the analysis package.
+Uses Numba when installed; callers must check NUMBA_AVAILABLE first.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, boundscheck=False)
+    def count_mismatches(alice_key: np.ndarray, bob_key: np.ndarray) -> int:
+        """
+        Count differing bits between two equal-length int8 0/1 arrays.
+
+        Only pass NumPy arrays here - Numba's reflected-list handling
+        for plain Python lists is slow and deprecated.
+        """
+        acc = 0
+        for i in range(alice_key.shape[0]):
+            acc += alice_key[i] ^ bob_key[i]
+        return acc
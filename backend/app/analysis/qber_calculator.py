@@ -2,7 +2,73 @@
 QBER Calculator Module
 Computes Quantum Bit Error Rate and security metrics.
 """
-from typing import List, Dict
+import math
+from bisect import bisect_left
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Mapping
+
+import numpy as np
+
+from app.analysis import _kernels
+
+# np.bitwise_count (hardware popcount) is only available from NumPy 2.0
+HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+
+
+def _count_mismatches(alice_key: np.ndarray, bob_key: np.ndarray) -> int:
+    """Count differing bits between two equal-length 0/1 arrays."""
+    if _kernels.NUMBA_AVAILABLE:
+        return int(_kernels.count_mismatches(alice_key, bob_key))
+    if HAS_BITWISE_COUNT:
+        # Pack 8 bits per byte and popcount the XOR
+        diff = np.bitwise_xor(np.packbits(alice_key), np.packbits(bob_key))
+        return int(np.bitwise_count(diff).sum())
+    return int(np.not_equal(alice_key, bob_key).sum())
+
+
+@lru_cache(maxsize=1024)
+def _binary_entropy(q_centipercent: int) -> float:
+    """
+    Binary entropy h(p) for a QBER given in hundredths of a percent.
+    
+    QBER is reported rounded to 2 decimals, so the number of distinct
+    inputs is small and the cache turns repeat calls into a lookup.
+    """
+    p = q_centipercent / 10000.0
+    return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+
+
+# Upper bounds (inclusive) of each recommendation band, QBER in percent
+_REC_THRESHOLDS = (5.0, 8.5, 15.0)
+# Recommendation per band. Read-only views, shared by every call; copy
+# with dict(...) if a mutable result is needed.
+_REC_VALUES = tuple(MappingProxyType(rec) for rec in (
+    {
+        "status": "excellent",
+        "message": "Channel is highly secure",
+        "action": "Proceed with key generation",
+        "color": "green"
+    },
+    {
+        "status": "acceptable",
+        "message": "Channel is secure but noisy",
+        "action": "Consider privacy amplification",
+        "color": "yellow"
+    },
+    {
+        "status": "warning",
+        "message": "Possible eavesdropping detected",
+        "action": "Abort key exchange, investigate",
+        "color": "orange"
+    },
+    {
+        "status": "critical",
+        "message": "Eavesdropping highly likely",
+        "action": "Abort immediately, channel compromised",
+        "color": "red"
+    },
+))
 
 
 class QBERCalculator:
@@ -17,6 +83,7 @@ class QBERCalculator:
     # Security threshold based on BB84 theory
     # Above this QBER, the channel is considered insecure
     SECURITY_THRESHOLD = 8.5  # Percentage
+    SECURITY_THRESHOLD_FRAC = SECURITY_THRESHOLD / 100
     
     def calculate(
         self,
@@ -35,7 +102,8 @@ class QBERCalculator:
         Returns:
             Dictionary containing QBER and security assessment
         """
-        if len(alice_key) == 0 or len(bob_key) == 0:
+        min_len = min(len(alice_key), len(bob_key))
+        if min_len == 0:
             return {
                 "qber": 0.0,
                 "is_secure": True,
@@ -45,13 +113,14 @@ class QBERCalculator:
                 "margin": self.SECURITY_THRESHOLD
             }
         
-        # Ensure equal lengths
-        min_len = min(len(alice_key), len(bob_key))
-        alice_key = alice_key[:min_len]
-        bob_key = bob_key[:min_len]
+        # Ensure equal lengths. Truncate the converted arrays (views)
+        # rather than slicing the inputs, which would copy lists; keys
+        # from the sifter are equal-length so this is usually a no-op.
+        alice_arr = np.asarray(alice_key, dtype=np.int8)[:min_len]
+        bob_arr = np.asarray(bob_key, dtype=np.int8)[:min_len]
         
         # Count mismatched bits
-        mismatched = sum(1 for a, b in zip(alice_key, bob_key) if a != b)
+        mismatched = _count_mismatches(alice_arr, bob_arr)
         
         # Calculate QBER percentage
         qber = (mismatched / min_len) * 100
@@ -98,7 +167,7 @@ class QBERCalculator:
         
         return round(leakage, 2)
     
-    def get_security_recommendation(self, qber: float) -> Dict:
+    def get_security_recommendation(self, qber: float) -> Mapping[str, str]:
         """
         Get security recommendation based on QBER.
         
@@ -106,36 +175,9 @@ class QBERCalculator:
             qber: Calculated QBER percentage
             
         Returns:
-            Dictionary with recommendation and action
+            Recommendation and action (a shared read-only mapping)
         """
-        if qber <= 5.0:
-            return {
-                "status": "excellent",
-                "message": "Channel is highly secure",
-                "action": "Proceed with key generation",
-                "color": "green"
-            }
-        elif qber <= 8.5:
-            return {
-                "status": "acceptable",
-                "message": "Channel is secure but noisy",
-                "action": "Consider privacy amplification",
-                "color": "yellow"
-            }
-        elif qber <= 15.0:
-            return {
-                "status": "warning",
-                "message": "Possible eavesdropping detected",
-                "action": "Abort key exchange, investigate",
-                "color": "orange"
-            }
-        else:
-            return {
-                "status": "critical",
-                "message": "Eavesdropping highly likely",
-                "action": "Abort immediately, channel compromised",
-                "color": "red"
-            }
+        return _REC_VALUES[bisect_left(_REC_THRESHOLDS, qber)]
     
     def estimate_secure_key_length(
         self,
@@ -155,16 +197,16 @@ class QBERCalculator:
         Returns:
             Estimated secure key length
         """
-        if qber >= self.SECURITY_THRESHOLD:
+        # Nothing to distil from an empty or insecure key
+        if sifted_length <= 0 or qber >= self.SECURITY_THRESHOLD:
             return 0
         
         # Binary entropy function approximation
-        qber_frac = qber / 100
-        if qber_frac == 0:
+        q_centipercent = int(round(qber * 100))
+        if q_centipercent == 0:
             efficiency = 1.0
         else:
-            import math
-            h_q = -qber_frac * math.log2(qber_frac) - (1-qber_frac) * math.log2(1-qber_frac)
+            h_q = _binary_entropy(q_centipercent)
             efficiency = 1 - 2 * h_q  # Rough privacy amplification bound
         
         secure_length = int(sifted_length * max(0, efficiency))
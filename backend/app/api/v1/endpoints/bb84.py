@@ -2,24 +2,38 @@
 BB84 Protocol API Endpoints
 Implements Quantum Key Distribution using the BB84 protocol.
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Body, Response
+from typing import Annotated, List
 import time
 
+import numpy as np
+import orjson
+
+from app.core.config import settings
+from app.core.errors import simulation_errors
+from app.core.responses import ORJSON_OPTIONS
 from app.models.schemas import (
     BB84SimulationRequest,
     BB84SimulationResult,
     BB84PresetsResponse,
     Basis,
 )
+from app.protocols.bb84.bases import encode_bases
 from app.protocols.bb84.circuit_builder import BB84CircuitBuilder
 from app.protocols.bb84.key_sifting import KeySifter
-from app.protocols.bb84.eve_attack import EveAttacker
+from app.protocols.bb84.eve_attack import intercept
 from app.analysis.qber_calculator import QBERCalculator
-from app.services.history_service import save_bb84_result
+from app.services.history_service import save_bb84_result, save_in_background
 
 router = APIRouter()
 
+# Upper bound on configurations per /simulate/batch call
+MAX_BATCH_SIZE = 16
+
+# Stateless helpers shared by every request
+_SIFTER = KeySifter()
+_QBER = QBERCalculator()
+
 
 # Preset configurations based on IEEE paper
 BB84_PRESETS = [
@@ -50,6 +64,9 @@ BB84_PRESETS = [
     },
 ]
 
+# Presets are immutable: validate and encode them once at import
+_PRESETS_JSON = BB84PresetsResponse(presets=BB84_PRESETS).model_dump_json()
+
 
 @router.get("/presets", response_model=BB84PresetsResponse)
 async def get_presets():
@@ -59,10 +76,140 @@ async def get_presets():
     These presets are based on configurations from published research
     and provide good starting points for experimentation.
     """
-    return BB84PresetsResponse(presets=BB84_PRESETS)
+    return Response(content=_PRESETS_JSON, media_type="application/json")
+
+
+def _run_simulation(request: BB84SimulationRequest) -> BB84SimulationResult:
+    """Run one BB84 simulation; shared by the single and batch endpoints."""
+    start_time = time.time()
+    
+    # Convert bases to list of strings
+    bases = [b.value for b in request.bases]
+    
+    # One generator drives every random draw in this run
+    rng = np.random.default_rng()
+    
+    # Build the BB84 circuit
+    circuit_builder = BB84CircuitBuilder(
+        n_qubits=request.n_qubits,
+        bases=bases,
+        rng=rng
+    )
+    
+    # Generate Alice's random bits and bases
+    alice_bits, alice_bases = circuit_builder.generate_alice_data()
+    
+    # Generate Bob's random measurement bases
+    bob_bases = circuit_builder.generate_bob_bases()
+    
+    # Build and execute the circuit
+    circuit, circuit_json = circuit_builder.build_circuit(
+        alice_bits=alice_bits,
+        alice_bases=alice_bases,
+        bob_bases=bob_bases,
+        shots=request.shots
+    )
+    
+    # Encode the bases once; the post-processing steps compare uint8 codes
+    alice_codes = encode_bases(alice_bases)
+    bob_codes = encode_bases(bob_bases)
+    
+    # Bob's measurements: closed form by default, or sampled from the circuit
+    if settings.BB84_ANALYTIC:
+        bob_measurements = circuit_builder.measure_analytic(
+            alice_bits=alice_bits,
+            alice_bases=alice_codes,
+            bob_bases=bob_codes
+        )
+    else:
+        bob_measurements = circuit_builder.execute(circuit, shots=request.shots)
+    
+    # Apply Eve attack if enabled
+    eve_data = None
+    if request.eve_attack:
+        eve_data = intercept(
+            rng,
+            alice_bits=alice_bits,
+            alice_bases=alice_codes,
+            bob_bases=bob_codes,
+            bob_measurements=bob_measurements,
+            intercept_ratio=request.eve_intercept_ratio,
+            bases=bases
+        )
+        # Eve's interference modifies Bob's measurements
+        bob_measurements = eve_data["modified_bob_measurements"]
+    
+    # Perform key sifting
+    sifted_result = _SIFTER.sift_keys(
+        alice_bits=alice_bits,
+        alice_bases=alice_codes,
+        bob_measurements=bob_measurements,
+        bob_bases=bob_codes
+    )
+    
+    # Calculate QBER
+    qber_result = _QBER.calculate(
+        alice_key=sifted_result["alice_key"],
+        bob_key=sifted_result["bob_key"]
+    )
+    
+    # Calculate information leakage (if Eve attacked)
+    info_leakage = 0.0
+    if eve_data:
+        info_leakage = _QBER.calculate_information_leakage(
+            eve_correct=eve_data.get("eve_correct_guesses", 0),
+            eve_total=eve_data.get("eve_intercept_count", 1)
+        )
+    
+    execution_time = (time.time() - start_time) * 1000
+
+    # Every value here is produced internally with the schema's types, so
+    # build the model without re-running field validation. The bit and
+    # index fields stay NumPy arrays; orjson writes them directly
+    return BB84SimulationResult.model_construct(
+        circuit_json=circuit_json,
+        circuit_depth=circuit_json["depth"],
+        alice_bits=alice_bits,
+        alice_bases=alice_bases,
+        bob_bases=bob_bases,
+        bob_measurements=np.asarray(bob_measurements),
+        sifted_alice_key=sifted_result["alice_key"],
+        sifted_bob_key=sifted_result["bob_key"],
+        matching_indices=sifted_result["matching_indices"],
+        eve_detected=not qber_result["is_secure"],
+        eve_intercepted_indices=eve_data.get("intercepted_indices") if eve_data else None,
+        eve_bases=eve_data.get("eve_bases") if eve_data else None,
+        eve_measurements=eve_data.get("eve_measurements") if eve_data else None,
+        qber=float(qber_result["qber"]),
+        is_secure=bool(qber_result["is_secure"]),
+        information_leakage=float(info_leakage),
+        key_efficiency=float(sifted_result["efficiency"]),
+        execution_time_ms=execution_time,
+        shots_used=request.shots
+    )
+
+
+def _encode_and_save(request: BB84SimulationRequest, result: BB84SimulationResult) -> bytes:
+    """
+    Encode a result for the response and schedule its history save.
+
+    The fields are encoded as-is with orjson and the same text is
+    stored in history.
+    """
+    body = orjson.dumps(dict(result), option=ORJSON_OPTIONS)
+
+    # Persist to history without holding up the response
+    save_in_background(
+        save_bb84_result,
+        config=request,
+        result=result,
+        result_json=body.decode(),
+    )
+    return body
 
 
 @router.post("/simulate", response_model=BB84SimulationResult)
+@simulation_errors("Simulation failed")
 async def simulate_bb84(request: BB84SimulationRequest):
     """
     Run a BB84 Quantum Key Distribution simulation.
@@ -82,113 +229,25 @@ async def simulate_bb84(request: BB84SimulationRequest):
     - QBER and security analysis
     - Eve's activity details (if enabled)
     """
-    start_time = time.time()
-    
-    try:
-        # Convert bases to list of strings
-        bases = [b.value for b in request.bases]
-        
-        # Build the BB84 circuit
-        circuit_builder = BB84CircuitBuilder(
-            n_qubits=request.n_qubits,
-            bases=bases
-        )
-        
-        # Generate Alice's random bits and bases
-        alice_bits, alice_bases = circuit_builder.generate_alice_data()
-        
-        # Generate Bob's random measurement bases
-        bob_bases = circuit_builder.generate_bob_bases()
-        
-        # Build and execute the circuit
-        circuit, circuit_json = circuit_builder.build_circuit(
-            alice_bits=alice_bits,
-            alice_bases=alice_bases,
-            bob_bases=bob_bases,
-            shots=request.shots
-        )
-        
-        # Execute simulation
-        bob_measurements = circuit_builder.execute(circuit, shots=request.shots)
-        
-        # Apply Eve attack if enabled
-        eve_data = None
-        if request.eve_attack:
-            eve_attacker = EveAttacker(
-                n_qubits=request.n_qubits,
-                intercept_ratio=request.eve_intercept_ratio,
-                bases=bases
-            )
-            eve_data = eve_attacker.intercept(
-                alice_bits=alice_bits,
-                alice_bases=alice_bases,
-                bob_bases=bob_bases,
-                bob_measurements=bob_measurements
-            )
-            # Eve's interference modifies Bob's measurements
-            bob_measurements = eve_data["modified_bob_measurements"]
-        
-        # Perform key sifting
-        key_sifter = KeySifter()
-        sifted_result = key_sifter.sift_keys(
-            alice_bits=alice_bits,
-            alice_bases=alice_bases,
-            bob_measurements=bob_measurements,
-            bob_bases=bob_bases
-        )
-        
-        # Calculate QBER
-        qber_calculator = QBERCalculator()
-        qber_result = qber_calculator.calculate(
-            alice_key=sifted_result["alice_key"],
-            bob_key=sifted_result["bob_key"]
-        )
-        
-        # Calculate information leakage (if Eve attacked)
-        info_leakage = 0.0
-        if eve_data:
-            info_leakage = qber_calculator.calculate_information_leakage(
-                eve_correct=eve_data.get("eve_correct_guesses", 0),
-                eve_total=eve_data.get("eve_intercept_count", 1)
-            )
-        
-        execution_time = (time.time() - start_time) * 1000
-
-        result = BB84SimulationResult(
-            circuit_json=circuit_json,
-            circuit_depth=circuit.depth() if hasattr(circuit, 'depth') else 0,
-            alice_bits=alice_bits,
-            alice_bases=alice_bases,
-            bob_bases=bob_bases,
-            bob_measurements=bob_measurements,
-            sifted_alice_key=sifted_result["alice_key"],
-            sifted_bob_key=sifted_result["bob_key"],
-            matching_indices=sifted_result["matching_indices"],
-            eve_detected=qber_result["qber"] > 8.5,
-            eve_intercepted_indices=eve_data.get("intercepted_indices") if eve_data else None,
-            eve_bases=eve_data.get("eve_bases") if eve_data else None,
-            eve_measurements=eve_data.get("eve_measurements") if eve_data else None,
-            qber=qber_result["qber"],
-            is_secure=qber_result["is_secure"],
-            information_leakage=info_leakage,
-            key_efficiency=sifted_result["efficiency"],
-            execution_time_ms=execution_time,
-            shots_used=request.shots
-        )
+    result = _run_simulation(request)
 
-        # Persist to history
-        try:
-            await save_bb84_result(
-                config=request.model_dump(mode="json"),
-                result=result.model_dump(mode="json"),
-            )
-        except Exception:
-            pass  # Don't fail the simulation if history save fails
-
-        return result
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Simulation failed: {str(e)}"
-        )
+    # A returned Response skips FastAPI's response_model re-validation
+    # of the result
+    body = _encode_and_save(request, result)
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/simulate/batch", response_model=List[BB84SimulationResult])
+@simulation_errors("Simulation failed")
+async def simulate_bb84_batch(
+    requests: Annotated[List[BB84SimulationRequest], Body(min_length=1, max_length=MAX_BATCH_SIZE)]
+):
+    """
+    Run several BB84 simulations in one call.
+
+    Each configuration is simulated independently, exactly as by
+    /simulate, and the results are returned in request order. Saves one
+    HTTP round trip, routing and response per configuration.
+    """
+    bodies = [_encode_and_save(request, _run_simulation(request)) for request in requests]
+    return Response(content=b"[" + b",".join(bodies) + b"]", media_type="application/json")
@@ -2,17 +2,47 @@
 Encryption API Endpoints
 """
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional
 
+import numpy as np
+
 from app.crypto.aes_encryption import AESEncryptor, PrivacyAmplification
 
 router = APIRouter(tags=["Encryption"])
 
 
-class EncryptRequest(BaseModel):
+class QuantumKeyRequest(BaseModel):
+    """
+    Base for requests carrying a quantum key, either as a bit list or
+    as hex (MSB first, 4 bits per digit). Exactly one must be given;
+    hex keeps request bodies small and skips per-bit validation.
+    """
+    quantum_key: Optional[list[int]] = Field(None, description="Quantum key as list of bits (0s and 1s)")
+    quantum_key_hex: Optional[str] = Field(None, description="Quantum key as a hex string (alternative to quantum_key)")
+
+    @field_validator("quantum_key_hex")
+    @classmethod
+    def _check_hex(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            bytes.fromhex(v)  # raises ValueError on malformed hex
+        return v
+
+    @model_validator(mode="after")
+    def _check_one_key(self):
+        if (self.quantum_key is None) == (self.quantum_key_hex is None):
+            raise ValueError("Provide exactly one of quantum_key or quantum_key_hex")
+        return self
+
+    def key_bits(self) -> "list[int] | np.ndarray":
+        """The key as bits, decoding quantum_key_hex if that was given."""
+        if self.quantum_key is not None:
+            return self.quantum_key
+        return np.unpackbits(np.frombuffer(bytes.fromhex(self.quantum_key_hex), dtype=np.uint8))
+
+
+class EncryptRequest(QuantumKeyRequest):
     """Request to encrypt data with quantum key"""
-    quantum_key: list[int] = Field(..., description="Quantum key as list of bits (0s and 1s)")
     plaintext: str = Field(..., description="Text to encrypt")
     key_size: int = Field(default=256, description="AES key size: 128, 192, or 256")
 
@@ -20,7 +50,7 @@ class EncryptRequest(BaseModel):
 class EncryptResponse(BaseModel):
     """Encryption result"""
     success: bool
-    ciphertext: str
+    ciphertext: str = Field(..., description="Base64 encoded ciphertext with the 16-byte GCM tag appended")
     iv: str
     key_hash: str
     algorithm: str
@@ -29,10 +59,9 @@ class EncryptResponse(BaseModel):
     key_bits_used: int
 
 
-class DecryptRequest(BaseModel):
-    """Request to decrypt data with quantum key"""
-    quantum_key: list[int] = Field(..., description="Same quantum key used for encryption")
-    ciphertext: str = Field(..., description="Base64 encoded ciphertext")
+class DecryptRequest(QuantumKeyRequest):
+    """Request to decrypt data with the same quantum key used for encryption"""
+    ciphertext: str = Field(..., description="Base64 encoded ciphertext with GCM tag appended")
     iv: str = Field(..., description="Base64 encoded initialization vector")
     key_size: int = Field(default=256, description="AES key size used for encryption")
 
@@ -72,14 +101,16 @@ async def encrypt_with_quantum_key(request: EncryptRequest):
     symmetric key for AES encryption.
     """
     try:
+        key_bits = request.key_bits()
+        
         # Validate key length
-        if len(request.quantum_key) < 128:
+        if len(key_bits) < 128:
             raise HTTPException(
                 status_code=400,
-                detail=f"Key too short: {len(request.quantum_key)} bits. Need at least 128 bits for AES-128."
+                detail=f"Key too short: {len(key_bits)} bits. Need at least 128 bits for AES-128."
             )
         
-        encryptor = AESEncryptor(request.quantum_key)
+        encryptor = AESEncryptor(key_bits)
         result = encryptor.encrypt(request.plaintext, request.key_size)
         
         return EncryptResponse(
@@ -90,7 +121,7 @@ async def encrypt_with_quantum_key(request: EncryptRequest):
             algorithm=result.algorithm,
             mode=result.mode,
             original_length=result.original_length,
-            key_bits_used=len(request.quantum_key)
+            key_bits_used=len(key_bits)
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -104,7 +135,7 @@ async def decrypt_with_quantum_key(request: DecryptRequest):
     Decrypt data using the same quantum key used for encryption.
     """
     try:
-        encryptor = AESEncryptor(request.quantum_key)
+        encryptor = AESEncryptor(request.key_bits())
         result = encryptor.decrypt(request.ciphertext, request.iv, request.key_size)
         
         return DecryptResponse(
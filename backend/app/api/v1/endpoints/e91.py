@@ -3,9 +3,16 @@ E91 Protocol API Endpoints
 Implements Quantum Key Distribution using the E91 (Ekert) protocol
 with Bell state entanglement and CHSH inequality verification.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+import asyncio
 import time
 
+import numpy as np
+from sqlalchemy import Text, cast, select
+
+from app.core.database import async_session
+from app.core.errors import simulation_errors
+from app.models.database import SimulationHistory
 from app.models.schemas import (
     E91SimulationRequest,
     E91SimulationResult,
@@ -14,12 +21,13 @@ from app.models.schemas import (
 from app.protocols.e91.entanglement import EntanglementGenerator
 from app.protocols.e91.chsh_validator import CHSHValidator
 from app.protocols.e91.reverse_gates import ReverseGateHandler
-from app.services.history_service import save_e91_result
+from app.services.history_service import save_e91_result, save_in_background
 
 router = APIRouter()
 
 
 @router.post("/simulate", response_model=E91SimulationResult)
+@simulation_errors("E91 simulation failed")
 async def simulate_e91(request: E91SimulationRequest):
     """
     Run an E91 Quantum Key Distribution simulation.
@@ -42,96 +50,102 @@ async def simulate_e91(request: E91SimulationRequest):
     """
     start_time = time.time()
     
-    try:
-        # Generate entangled pairs
-        entanglement_gen = EntanglementGenerator(
-            n_pairs=request.n_pairs,
-            noise_level=request.noise_level
-        )
-        
-        circuit, circuit_json = entanglement_gen.create_bell_pairs()
-        
-        # Execute measurements at various angles
-        alice_angles = request.alice_angles
-        bob_angles = request.bob_angles
-        
-        correlations = entanglement_gen.measure_correlations(
-            circuit=circuit,
-            alice_angles=alice_angles,
-            bob_angles=bob_angles,
-            shots=request.shots
-        )
-        
-        # Perform CHSH inequality test
-        chsh_validator = CHSHValidator()
-        chsh_result = chsh_validator.calculate_chsh(correlations)
-        
-        # Check for Eve and apply reverse gates if detected
-        is_secure = chsh_result["s_parameter"] > 2.0
-        eve_detected = not is_secure
-        
-        if eve_detected and request.eve_attack:
-            # Apply reverse gates mechanism
-            reverse_handler = ReverseGateHandler()
-            reverse_handler.apply_reverse_gates(
-                correlations=correlations,
-                s_parameter=chsh_result["s_parameter"]
-            )
-        
-        # Extract sifted keys from matching angle measurements
-        sifted_alice, sifted_bob = entanglement_gen.extract_keys(
+    # Generate entangled pairs
+    entanglement_gen = EntanglementGenerator(
+        n_pairs=request.n_pairs,
+        noise_level=request.noise_level
+    )
+    
+    circuit, circuit_json = entanglement_gen.create_bell_pairs()
+    
+    # Execute measurements at various angles
+    alice_angles = request.alice_angles
+    bob_angles = request.bob_angles
+    
+    # Aer runs the angle-pair experiments in C++ with the GIL released;
+    # do it in a worker thread so other requests keep being served
+    correlations = await asyncio.to_thread(
+        entanglement_gen.measure_correlations,
+        circuit=circuit,
+        alice_angles=alice_angles,
+        bob_angles=bob_angles,
+        shots=request.shots
+    )
+    
+    # Perform CHSH inequality test
+    chsh_validator = CHSHValidator()
+    chsh_result = chsh_validator.calculate_chsh(correlations)
+    
+    # Check for Eve and apply reverse gates if detected
+    is_secure = chsh_result["s_parameter"] > 2.0
+    eve_detected = not is_secure
+    
+    if eve_detected and request.eve_attack:
+        # Apply reverse gates mechanism
+        reverse_handler = ReverseGateHandler()
+        reverse_handler.apply_reverse_gates(
             correlations=correlations,
-            alice_angles=alice_angles,
-            bob_angles=bob_angles
+            s_parameter=chsh_result["s_parameter"]
         )
-        
-        # Calculate key match rate
-        if len(sifted_alice) > 0:
-            matches = sum(1 for a, b in zip(sifted_alice, sifted_bob) if a == b)
-            key_match_rate = (matches / len(sifted_alice)) * 100
-        else:
-            key_match_rate = 0.0
-        
-        execution_time = (time.time() - start_time) * 1000
+    
+    # Extract sifted keys from matching angle measurements
+    sifted_alice, sifted_bob = entanglement_gen.extract_keys(
+        correlations=correlations,
+        alice_angles=alice_angles,
+        bob_angles=bob_angles
+    )
+    
+    # Calculate key match rate
+    n_key = min(len(sifted_alice), len(sifted_bob))
+    if n_key > 0:
+        matches = int(np.equal(
+            np.asarray(sifted_alice[:n_key], dtype=np.int8),
+            np.asarray(sifted_bob[:n_key], dtype=np.int8),
+        ).sum())
+        key_match_rate = (matches / n_key) * 100
+    else:
+        key_match_rate = 0.0
+    
+    execution_time = (time.time() - start_time) * 1000
 
-        result = E91SimulationResult(
-            circuit_json=circuit_json,
-            circuit_depth=circuit.depth() if hasattr(circuit, 'depth') else 0,
-            alice_angles_used=alice_angles,
-            bob_angles_used=bob_angles,
-            correlations=correlations,
-            chsh_result=CHSHResult(
-                s_parameter=chsh_result["s_parameter"],
-                classical_bound=2.0,
-                quantum_max=2.828,
-                violates_classical=chsh_result["s_parameter"] > 2.0,
-                expectation_values=chsh_result["expectation_values"]
-            ),
-            is_secure=is_secure,
-            eve_detected=eve_detected,
-            sifted_alice_key=sifted_alice,
-            sifted_bob_key=sifted_bob,
-            key_match_rate=key_match_rate,
-            execution_time_ms=execution_time,
-            shots_per_combination=request.shots
-        )
+    # Every value here is produced internally with the schema's types, so
+    # build the models without re-running field validation
+    result = E91SimulationResult.model_construct(
+        circuit_json=circuit_json,
+        circuit_depth=circuit_json["depth"],
+        alice_angles_used=alice_angles,
+        bob_angles_used=bob_angles,
+        correlations=correlations,
+        chsh_result=CHSHResult.model_construct(
+            s_parameter=float(chsh_result["s_parameter"]),
+            classical_bound=2.0,
+            quantum_max=2.828,
+            violates_classical=chsh_result["s_parameter"] > 2.0,
+            expectation_values=chsh_result["expectation_values"]
+        ),
+        is_secure=is_secure,
+        eve_detected=eve_detected,
+        sifted_alice_key=sifted_alice,
+        sifted_bob_key=sifted_bob,
+        key_match_rate=key_match_rate,
+        execution_time_ms=execution_time,
+        shots_per_combination=request.shots
+    )
 
-        # Persist to history
-        try:
-            await save_e91_result(
-                config=request.model_dump(mode="json"),
-                result=result.model_dump(mode="json"),
-            )
-        except Exception:
-            pass  # Don't fail the simulation if history save fails
+    # Encode once with Pydantic's serializer and store the same text in
+    # history; a returned Response also skips FastAPI's response_model
+    # re-validation of the result
+    body = result.model_dump_json()
 
-        return result
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"E91 simulation failed: {str(e)}"
-        )
+    # Persist to history without holding up the response
+    save_in_background(
+        save_e91_result,
+        config=request,
+        result=result,
+        result_json=body,
+    )
+
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/analyze/{simulation_id}")
@@ -139,14 +153,16 @@ async def analyze_e91(simulation_id: str):
     """
     Get detailed CHSH analysis for a completed E91 simulation.
     Retrieves full result from history database.
-    """
-    from fastapi import Depends
-    from sqlalchemy.ext.asyncio import AsyncSession
-    from app.core.database import async_session
-    from app.models.database import SimulationHistory
 
+    The stored JSON text is returned as-is, skipping ORM hydration
+    and re-serialization of the result document.
+    """
+    query = select(cast(SimulationHistory.full_result, Text)).where(
+        SimulationHistory.id == simulation_id,
+        SimulationHistory.protocol == "E91",
+    )
     async with async_session() as db:
-        record = await db.get(SimulationHistory, simulation_id)
-        if not record or record.protocol != "E91":
-            raise HTTPException(status_code=404, detail="E91 simulation not found")
-        return record.full_result
+        full_result = (await db.execute(query)).scalar_one_or_none()
+    if full_result is None:
+        raise HTTPException(status_code=404, detail="E91 simulation not found")
+    return Response(content=full_result, media_type="application/json")
@@ -2,22 +2,39 @@
 Health Check Endpoints
 Provides system health and status information.
 """
-from fastapi import APIRouter
+import orjson
+
+from fastapi import APIRouter, Response
 
 router = APIRouter()
 
 
+HEALTH_STATUS = {
+    "status": "healthy",
+    "service": "QKD Simulator API",
+    "version": "1.0.0"
+}
+
+READINESS_STATUS = {
+    "ready": True,
+    "checks": {
+        "api": True,
+        "qiskit": True  # Will be enhanced in Phase 4
+    }
+}
+
+# Static payloads are encoded once at import and served as raw bytes
+_HEALTH_BODY = orjson.dumps(HEALTH_STATUS)
+_READINESS_BODY = orjson.dumps(READINESS_STATUS)
+
+
 @router.get("/")
 async def health_check():
     """
     Health check endpoint.
     Returns the current status of the API and its dependencies.
     """
-    return {
-        "status": "healthy",
-        "service": "QKD Simulator API",
-        "version": "1.0.0"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @router.get("/ready")
@@ -26,10 +43,4 @@ async def readiness_check():
     Readiness check - indicates if the service is ready to accept requests.
     This can include checks for database connections, external services, etc.
     """
-    return {
-        "ready": True,
-        "checks": {
-            "api": True,
-            "qiskit": True  # Will be enhanced in Phase 4
-        }
-    }
+    return Response(content=_READINESS_BODY, media_type="application/json")
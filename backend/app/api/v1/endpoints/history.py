@@ -2,10 +2,13 @@
 Simulation History API Endpoints
 CRUD operations for persisted simulation results.
 """
+from operator import itemgetter
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc, func, update, delete, String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.core.database import get_db
 from app.models.database import SimulationHistory
@@ -20,6 +23,70 @@ from app.models.history_schemas import (
 router = APIRouter()
 
 
+class _iso_timestamp(FunctionElement):
+    """
+    Render a timestamp column as ISO-8601 text in the database, matching
+    datetime.isoformat(), so list rows never become datetime objects.
+    """
+    type = String()
+    inherit_cache = True
+
+
+@compiles(_iso_timestamp)
+def _compile_iso_timestamp(element, compiler, **kw):
+    # SQLite stores "YYYY-MM-DD HH:MM:SS.ffffff" text
+    return "replace(%s, ' ', 'T')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(_iso_timestamp, "postgresql")
+def _compile_iso_timestamp_pg(element, compiler, **kw):
+    # Values are written in UTC, which isoformat() renders as +00:00
+    return (
+        "to_char(%s AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US\"+00:00\"')"
+        % compiler.process(element.clauses, **kw)
+    )
+
+
+# Every endpoint renders created_at through this one expression, so
+# list, detail and compare responses format a timestamp identically
+_CREATED_AT_ISO = _iso_timestamp(SimulationHistory.created_at).label("created_at")
+
+# Summary columns for the list view; the JSON documents are never loaded
+_SUMMARY_COLUMNS = (
+    SimulationHistory.id,
+    SimulationHistory.protocol,
+    _CREATED_AT_ISO,
+    SimulationHistory.is_secure,
+    SimulationHistory.eve_attack,
+    SimulationHistory.eve_detected,
+    SimulationHistory.qber,
+    SimulationHistory.s_parameter,
+    SimulationHistory.key_efficiency,
+    SimulationHistory.key_match_rate,
+    SimulationHistory.sifted_key_length,
+    SimulationHistory.execution_time_ms,
+    SimulationHistory.label,
+)
+
+# Fields shown for each side of a comparison, in response order
+_COMPARE_FIELDS = (
+    "id", "protocol", "created_at", "config", "is_secure", "eve_attack",
+    "eve_detected", "qber", "s_parameter", "key_efficiency", "key_match_rate",
+    "sifted_key_length", "execution_time_ms", "label",
+)
+_COMPARE_COLUMNS = tuple(
+    _CREATED_AT_ISO if field == "created_at" else getattr(SimulationHistory, field)
+    for field in _COMPARE_FIELDS
+)
+
+# Numeric fields diffed between the two simulations (sim2 - sim1)
+_DELTA_FIELDS = (
+    "qber", "s_parameter", "key_efficiency", "key_match_rate",
+    "sifted_key_length", "execution_time_ms",
+)
+_delta_values = itemgetter(*_DELTA_FIELDS)
+
+
 @router.get("", response_model=HistoryListResponse)
 async def list_history(
     protocol: Optional[str] = Query(None, description="Filter by protocol (BB84 or E91)"),
@@ -30,41 +97,37 @@ async def list_history(
     db: AsyncSession = Depends(get_db),
 ):
     """List simulation history with optional filters."""
-    query = select(SimulationHistory).order_by(desc(SimulationHistory.created_at))
-
+    filters = []
     if protocol:
-        query = query.where(SimulationHistory.protocol == protocol.upper())
+        filters.append(SimulationHistory.protocol == protocol.upper())
     if eve_attack is not None:
-        query = query.where(SimulationHistory.eve_attack == eve_attack)
+        filters.append(SimulationHistory.eve_attack == eve_attack)
     if is_secure is not None:
-        query = query.where(SimulationHistory.is_secure == is_secure)
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar() or 0
-
-    # Apply pagination
-    query = query.offset(offset).limit(limit)
-    results = (await db.execute(query)).scalars().all()
-
-    items = [
-        HistoryItem(
-            id=r.id,
-            protocol=r.protocol,
-            created_at=r.created_at.isoformat(),
-            is_secure=r.is_secure,
-            eve_attack=r.eve_attack,
-            eve_detected=r.eve_detected,
-            qber=r.qber,
-            s_parameter=r.s_parameter,
-            key_efficiency=r.key_efficiency,
-            key_match_rate=r.key_match_rate,
-            sifted_key_length=r.sifted_key_length,
-            execution_time_ms=r.execution_time_ms,
-            label=r.label,
-        )
-        for r in results
-    ]
+        filters.append(SimulationHistory.is_secure == is_secure)
+
+    # The window count is evaluated before LIMIT/OFFSET, so the filtered
+    # total comes back with the page in a single round-trip
+    query = (
+        select(*_SUMMARY_COLUMNS, func.count().over().label("total_count"))
+        .where(*filters)
+        .order_by(desc(SimulationHistory.created_at))
+        .offset(offset)
+        .limit(limit)
+    )
+
+    # Stream rows in batches (a server-side cursor on PostgreSQL) and
+    # build items as they arrive instead of materializing the page first
+    items = []
+    total = 0
+    stream = await db.stream(query.execution_options(yield_per=50))
+    async for row in stream.mappings():
+        total = row["total_count"]
+        items.append(HistoryItem(**row))
+
+    if not items and offset:
+        # Paged past the end: no row carries the total, count separately
+        count_query = select(func.count()).select_from(SimulationHistory).where(*filters)
+        total = (await db.execute(count_query)).scalar() or 0
 
     return HistoryListResponse(items=items, total=total, limit=limit, offset=offset)
 
@@ -75,43 +138,36 @@ async def get_history_detail(
     db: AsyncSession = Depends(get_db),
 ):
     """Get full details of a specific simulation."""
-    result = await db.get(SimulationHistory, simulation_id)
-    if not result:
+    query = select(
+        *_SUMMARY_COLUMNS, SimulationHistory.config, SimulationHistory.full_result
+    ).where(SimulationHistory.id == simulation_id)
+    row = (await db.execute(query)).mappings().first()
+    if not row:
         raise HTTPException(status_code=404, detail="Simulation not found")
 
-    return HistoryDetailResponse(
-        id=result.id,
-        protocol=result.protocol,
-        created_at=result.created_at.isoformat(),
-        config=result.config,
-        is_secure=result.is_secure,
-        eve_attack=result.eve_attack,
-        eve_detected=result.eve_detected,
-        qber=result.qber,
-        s_parameter=result.s_parameter,
-        key_efficiency=result.key_efficiency,
-        key_match_rate=result.key_match_rate,
-        sifted_key_length=result.sifted_key_length,
-        execution_time_ms=result.execution_time_ms,
-        label=result.label,
-        full_result=result.full_result,
-    )
+    return HistoryDetailResponse(**row)
 
 
 @router.patch("/{simulation_id}")
 async def update_history(
     simulation_id: str,
-    update: HistoryUpdateRequest,
+    changes: HistoryUpdateRequest,
     db: AsyncSession = Depends(get_db),
 ):
     """Update a simulation label."""
-    result = await db.get(SimulationHistory, simulation_id)
-    if not result:
+    # UPDATE ... RETURNING finds and modifies the row in one round-trip
+    if changes.label is not None:
+        stmt = (
+            update(SimulationHistory)
+            .where(SimulationHistory.id == simulation_id)
+            .values(label=changes.label)
+            .returning(SimulationHistory.id)
+        )
+    else:
+        stmt = select(SimulationHistory.id).where(SimulationHistory.id == simulation_id)
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Simulation not found")
 
-    if update.label is not None:
-        result.label = update.label
-
     await db.commit()
     return {"status": "updated", "id": simulation_id}
 
@@ -122,11 +178,14 @@ async def delete_history(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a simulation from history."""
-    result = await db.get(SimulationHistory, simulation_id)
-    if not result:
+    stmt = (
+        delete(SimulationHistory)
+        .where(SimulationHistory.id == simulation_id)
+        .returning(SimulationHistory.id)
+    )
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Simulation not found")
 
-    await db.delete(result)
     await db.commit()
     return {"status": "deleted", "id": simulation_id}
 
@@ -138,41 +197,23 @@ async def compare_simulations(
     db: AsyncSession = Depends(get_db),
 ):
     """Compare two simulations side-by-side."""
-    sim1 = await db.get(SimulationHistory, id1)
-    sim2 = await db.get(SimulationHistory, id2)
+    query = select(*_COMPARE_COLUMNS).where(SimulationHistory.id.in_((id1, id2)))
+    by_id = {row["id"]: dict(row) for row in (await db.execute(query)).mappings()}
+    m1 = by_id.get(id1)
+    m2 = by_id.get(id2)
 
-    if not sim1 or not sim2:
+    if not m1 or not m2:
         raise HTTPException(status_code=404, detail="One or both simulations not found")
 
-    def _metrics(sim: SimulationHistory) -> dict:
-        return {
-            "id": sim.id,
-            "protocol": sim.protocol,
-            "created_at": sim.created_at.isoformat(),
-            "config": sim.config,
-            "is_secure": sim.is_secure,
-            "eve_attack": sim.eve_attack,
-            "eve_detected": sim.eve_detected,
-            "qber": sim.qber,
-            "s_parameter": sim.s_parameter,
-            "key_efficiency": sim.key_efficiency,
-            "key_match_rate": sim.key_match_rate,
-            "sifted_key_length": sim.sifted_key_length,
-            "execution_time_ms": sim.execution_time_ms,
-            "label": sim.label,
-        }
-
-    # Compute deltas for shared numeric metrics
-    deltas = {}
-    for field in ["qber", "s_parameter", "key_efficiency", "key_match_rate",
-                   "sifted_key_length", "execution_time_ms"]:
-        v1 = getattr(sim1, field)
-        v2 = getattr(sim2, field)
-        if v1 is not None and v2 is not None:
-            deltas[field] = round(v2 - v1, 4)
+    # Compute deltas for shared numeric metrics from the plain dicts
+    deltas = {
+        field: round(v2 - v1, 4)
+        for field, v1, v2 in zip(_DELTA_FIELDS, _delta_values(m1), _delta_values(m2))
+        if v1 is not None and v2 is not None
+    }
 
     return CompareResponse(
-        simulation_1=_metrics(sim1),
-        simulation_2=_metrics(sim2),
+        simulation_1=m1,
+        simulation_2=m2,
         deltas=deltas,
     )
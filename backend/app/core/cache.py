@@ -2,39 +2,106 @@
 Redis caching layer for simulation results.
 Falls back to in-memory LRU cache when Redis is unavailable.
 """
-import json
 import hashlib
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Any
 
+import orjson
+
 from app.core.config import settings
 
-# In-memory fallback cache
-_memory_cache: dict[str, str] = {}
+# Cache keys are not a security boundary: prefer a fast non-cryptographic
+# hash, with BLAKE2b from the stdlib when xxhash is not installed
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# MessagePack is more compact and faster to decode than JSON for the
+# int/float-heavy simulation results; orjson is the fallback
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# First byte of every cached blob names its encoding, so the format can
+# change without invalidating entries written by older processes
+_FORMAT_JSON = b"\x00"
+_FORMAT_MSGPACK = b"\x01"
+
+# In-memory fallback cache, kept in least- to most-recently-used order
+MEMORY_CACHE_SIZE = 500
+_memory_cache: OrderedDict[str, bytes] = OrderedDict()
 _redis_client = None
+REDIS_MAX_CONNECTIONS = 50
 
 
-async def get_redis():
-    """Get Redis client, returning None if unavailable."""
+def _encode(value: Any) -> bytes:
+    if MSGPACK_AVAILABLE:
+        return _FORMAT_MSGPACK + msgpack.packb(value, use_bin_type=True)
+    return _FORMAT_JSON + orjson.dumps(value)
+
+
+def _decode(blob: bytes) -> Any | None:
+    fmt, payload = blob[:1], blob[1:]
+    if fmt == _FORMAT_MSGPACK and MSGPACK_AVAILABLE:
+        return msgpack.unpackb(payload, raw=False)
+    if fmt == _FORMAT_JSON:
+        return orjson.loads(payload)
+    return None  # Unknown or unreadable format: treat as a miss
+
+
+async def init_redis() -> None:
+    """
+    Connect the shared Redis client once at startup.
+    
+    The client owns a connection pool reused by every request. Values
+    are stored as encoded bytes, so responses are not decoded to str.
+    Leaves the client unset (in-memory fallback) if Redis is unreachable.
+    get_redis is the single way to reach it.
+    """
     global _redis_client
-    if _redis_client is not None:
-        return _redis_client
     if not settings.REDIS_URL:
-        return None
+        return
+    client = None
     try:
         import redis.asyncio as aioredis
-        _redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-        await _redis_client.ping()
-        return _redis_client
+        client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=False,
+            max_connections=REDIS_MAX_CONNECTIONS,
+        )
+        await client.ping()
     except Exception:
+        if client is not None:
+            await client.aclose()
+        return
+    _redis_client = client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and its pool on shutdown."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
         _redis_client = None
-        return None
+
+
+async def get_redis():
+    """Get the shared Redis client, or None if unavailable (usable with Depends)."""
+    return _redis_client
 
 
 def _make_key(prefix: str, params: dict) -> str:
     """Create a deterministic cache key from parameters."""
-    raw = json.dumps(params, sort_keys=True)
-    digest = hashlib.sha256(raw.encode()).hexdigest()[:16]
+    raw = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+    if XXHASH_AVAILABLE:
+        digest = xxhash.xxh3_64_hexdigest(raw)
+    else:
+        digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
     return f"qkd:{prefix}:{digest}"
 
 
@@ -45,25 +112,26 @@ async def cache_get(prefix: str, params: dict) -> Any | None:
     if redis:
         val = await redis.get(key)
         if val:
-            return json.loads(val)
+            return _decode(val)
     elif key in _memory_cache:
-        return json.loads(_memory_cache[key])
+        _memory_cache.move_to_end(key)
+        return _decode(_memory_cache[key])
     return None
 
 
 async def cache_set(prefix: str, params: dict, value: Any, ttl: int = 300) -> None:
     """Store a value in cache with TTL (seconds)."""
     key = _make_key(prefix, params)
-    data = json.dumps(value)
+    data = _encode(value)
     redis = await get_redis()
     if redis:
         await redis.set(key, data, ex=ttl)
     else:
         _memory_cache[key] = data
-        # Basic memory cache size limit
-        if len(_memory_cache) > 500:
-            oldest = next(iter(_memory_cache))
-            del _memory_cache[oldest]
+        _memory_cache.move_to_end(key)
+        # Evict the least recently used entry
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
 
 
 async def cache_invalidate(prefix: str, params: dict) -> None:
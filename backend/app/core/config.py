@@ -23,9 +23,22 @@ class Settings(BaseSettings):
     DEFAULT_SHOTS: int = 1024
     MAX_QUBITS: int = 20
     
+    # Compute Bob's BB84 outcomes in closed form instead of sampling the
+    # circuit's gates with shots (the circuit is still built for display)
+    BB84_ANALYTIC: bool = True
+    
     # Optional: Database URL (Phase 4)
     DATABASE_URL: str | None = None
     
+    # Create tables with metadata.create_all at startup (local dev);
+    # deployments turn this off and run `alembic upgrade head` instead
+    SCHEMA_AUTO_CREATE: bool = True
+    
+    # Database engine tuning
+    SQL_ECHO: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    
     # Optional: Redis URL (Phase 4)
     REDIS_URL: str | None = None
     
@@ -2,6 +2,9 @@
 Database configuration and session management.
 Uses SQLite by default, supports PostgreSQL via DATABASE_URL.
 """
+import orjson
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -10,8 +13,47 @@ from app.core.config import settings
 
 # Default to SQLite for local development
 DATABASE_URL = settings.DATABASE_URL or "sqlite+aiosqlite:///./qkd_simulator.db"
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+class PreEncodedJSON(str):
+    """
+    JSON text that is already serialized (e.g. by Pydantic's
+    model_dump_json). Bound to JSON columns verbatim instead of
+    being encoded a second time.
+    """
+
+
+def _json_serializer(value) -> str:
+    if isinstance(value, PreEncodedJSON):
+        return str(value)
+    return orjson.dumps(value).decode()
+
+
+# SQLite connections are cheap and serialized on writes; pool sizing
+# only matters for server databases
+_pool_options = {} if IS_SQLITE else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.SQL_ECHO,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **_pool_options,
+)
 
-engine = create_async_engine(DATABASE_URL, echo=settings.DEBUG)
+if IS_SQLITE:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL so history reads don't block on background writes."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -26,6 +68,8 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db():
-    """Create all tables on startup."""
+    """Create all tables on startup when SCHEMA_AUTO_CREATE is set."""
+    if not settings.SCHEMA_AUTO_CREATE:
+        return
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
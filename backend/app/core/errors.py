@@ -0,0 +1,33 @@
+"""
+Error types shared by the API endpoints.
+"""
+from functools import wraps
+
+from fastapi import HTTPException
+
+
+class SimulationError(Exception):
+    """A simulation failed unexpectedly; reported as a 500 with its cause."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def simulation_errors(prefix: str):
+    """
+    Decorate a simulate endpoint so unexpected errors become a
+    SimulationError with detail "<prefix>: <cause>". HTTPExceptions pass
+    through unchanged; other routes keep the generic 500.
+    """
+    def decorator(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as exc:
+                raise SimulationError(f"{prefix}: {exc}") from exc
+        return wrapper
+    return decorator
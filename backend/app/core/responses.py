@@ -0,0 +1,20 @@
+"""
+Response classes shared by the API.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# NumPy arrays and scalars are written natively (no .tolist() round
+# trip), and dicts with int keys are accepted without conversion
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson using ORJSON_OPTIONS."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
@@ -0,0 +1,31 @@
+"""
+Compiled numerical kernels for the crypto package.
+Uses Numba when installed; callers must check NUMBA_AVAILABLE first.
+"""
+import math
+
+try:
+    from numba import vectorize
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @vectorize(["int64(int64, float64)"], cache=True)
+    def secure_lengths(raw_key_length, qber):
+        """
+        Element-wise PrivacyAmplification.calculate_secure_length over
+        arrays of raw lengths and QBERs (0-1).
+        """
+        if qber >= 0.11:
+            return 0
+        if qber <= 0.0:
+            h = 0.0
+        else:
+            h = -qber * math.log2(qber) - (1 - qber) * math.log2(1 - qber)
+        key_rate = 1 - 2 * h
+        if key_rate <= 0:
+            return 0
+        return max(0, int(raw_key_length * key_rate * 0.9))
@@ -5,24 +5,46 @@ Uses quantum-generated keys for symmetric encryption
 import os
 import base64
 import hashlib
+from math import log2
 from typing import Tuple, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+from app.crypto import _kernels
+
 # Try to import cryptography, fall back to mock if not available
 try:
     from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
     from cryptography.hazmat.backends import default_backend
-    from cryptography.hazmat.primitives import padding
+    from cryptography.exceptions import InvalidTag
     CRYPTO_AVAILABLE = True
 except ImportError:
     CRYPTO_AVAILABLE = False
 
+# GCM uses a 96-bit nonce and a 128-bit authentication tag
+GCM_IV_BYTES = 12
+GCM_TAG_BYTES = 16
+
+
+def _xor_with_key(data: bytes, key: bytes) -> bytes:
+    """XOR data with the key repeated to its length (mock cipher)"""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    return (buf ^ np.resize(np.frombuffer(key, dtype=np.uint8), buf.shape)).tobytes()
+
+
+def binary_entropy(p: float) -> float:
+    """Binary entropy h(p) in bits; 0 at the endpoints."""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return -p * log2(p) - (1 - p) * log2(1 - p)
+
 
 @dataclass
 class EncryptionResult:
     """Result of encryption operation"""
-    ciphertext: str  # Base64 encoded
-    iv: str  # Base64 encoded initialization vector
+    ciphertext: str  # Base64 encoded, GCM tag appended
+    iv: str  # Base64 encoded initialization vector (nonce)
     key_hash: str  # SHA256 hash of the key (for verification)
     algorithm: str
     mode: str
@@ -62,26 +84,24 @@ class AESEncryptor:
         # Validate key size
         if self.key_size < 128:
             raise ValueError(f"Key too short: {self.key_size} bits. Minimum 128 bits required for AES-128.")
+        
+        # Derived material depends only on the key, so compute it once
+        self._key_hash = hashlib.sha256(self.key_bytes).hexdigest()[:16]
+        self._aes_keys: dict[int, bytes] = {}
     
     def _bits_to_bytes(self, bits: list[int]) -> bytes:
-        """Convert list of bits to bytes"""
-        # Pad to multiple of 8
-        padded_bits = bits + [0] * ((8 - len(bits) % 8) % 8)
-        
-        byte_array = []
-        for i in range(0, len(padded_bits), 8):
-            byte_val = 0
-            for j in range(8):
-                byte_val = (byte_val << 1) | padded_bits[i + j]
-            byte_array.append(byte_val)
-        
-        return bytes(byte_array)
+        """Convert list of bits to bytes (MSB first, zero-padded to a byte)"""
+        return np.packbits(np.asarray(bits, dtype=np.uint8)).tobytes()
     
     def _get_aes_key(self, target_bits: int = 256) -> bytes:
         """
         Get AES key of specified size.
         Uses SHA-256 for key derivation if needed.
         """
+        cached = self._aes_keys.get(target_bits)
+        if cached is not None:
+            return cached
+        
         if target_bits not in self.SUPPORTED_KEY_SIZES:
             raise ValueError(f"Unsupported key size: {target_bits}")
         
@@ -89,20 +109,27 @@ class AESEncryptor:
         
         if len(self.key_bytes) >= target_bytes:
             # Use first N bytes directly
-            return self.key_bytes[:target_bytes]
+            key = self.key_bytes[:target_bytes]
         else:
             # Use key derivation (hash stretching)
             # In production, use proper KDF like HKDF
             derived = hashlib.sha256(self.key_bytes).digest()
-            return derived[:target_bytes]
+            key = derived[:target_bytes]
+        
+        self._aes_keys[target_bits] = key
+        return key
     
     def get_key_hash(self) -> str:
         """Get SHA-256 hash of the key for verification"""
-        return hashlib.sha256(self.key_bytes).hexdigest()[:16]
+        return self._key_hash
     
     def encrypt(self, plaintext: str, key_size: int = 256) -> EncryptionResult:
         """
-        Encrypt plaintext using AES-CBC with the quantum key.
+        Encrypt plaintext using AES-GCM with the quantum key.
+        
+        GCM authenticates in the same pass and needs no padding. The
+        16-byte tag is appended to the ciphertext, so decrypt() needs
+        only the ciphertext and IV.
         
         Args:
             plaintext: Text to encrypt
@@ -116,53 +143,55 @@ class AESEncryptor:
             return self._mock_encrypt(plaintext, key_size)
         
         key = self._get_aes_key(key_size)
-        iv = os.urandom(16)  # 128-bit IV for CBC
-        
-        # Pad plaintext to block size
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(plaintext.encode('utf-8')) + padder.finalize()
+        iv = os.urandom(GCM_IV_BYTES)
         
-        # Encrypt
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        # Encrypt and authenticate
+        cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend())
         encryptor = cipher.encryptor()
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
+        ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
+        tag = encryptor.tag
         
         return EncryptionResult(
-            ciphertext=base64.b64encode(ciphertext).decode('utf-8'),
+            ciphertext=base64.b64encode(ciphertext + tag).decode('utf-8'),
             iv=base64.b64encode(iv).decode('utf-8'),
             key_hash=self.get_key_hash(),
             algorithm=f"AES-{key_size}",
-            mode="CBC",
+            mode="GCM",
             original_length=len(plaintext)
         )
     
     def decrypt(self, ciphertext_b64: str, iv_b64: str, key_size: int = 256) -> DecryptionResult:
         """
-        Decrypt ciphertext using AES-CBC with the quantum key.
+        Decrypt ciphertext using AES-GCM with the quantum key.
         
         Args:
-            ciphertext_b64: Base64 encoded ciphertext
+            ciphertext_b64: Base64 encoded ciphertext with the GCM tag appended
             iv_b64: Base64 encoded initialization vector
             key_size: AES key size in bits
             
         Returns:
             DecryptionResult with plaintext
+            
+        Raises:
+            ValueError: If the ciphertext fails authentication
         """
         if not CRYPTO_AVAILABLE:
             return self._mock_decrypt(ciphertext_b64, iv_b64, key_size)
         
         key = self._get_aes_key(key_size)
         iv = base64.b64decode(iv_b64)
-        ciphertext = base64.b64decode(ciphertext_b64)
+        data = base64.b64decode(ciphertext_b64)
+        if len(data) < GCM_TAG_BYTES:
+            raise ValueError("Ciphertext too short to contain an authentication tag")
+        ciphertext, tag = data[:-GCM_TAG_BYTES], data[-GCM_TAG_BYTES:]
         
-        # Decrypt
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        # Decrypt and verify the tag
+        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=default_backend())
         decryptor = cipher.decryptor()
-        padded_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-        
-        # Unpad
-        unpadder = padding.PKCS7(128).unpadder()
-        plaintext = unpadder.update(padded_plaintext) + unpadder.finalize()
+        try:
+            plaintext = decryptor.update(ciphertext) + decryptor.finalize()
+        except InvalidTag:
+            raise ValueError("Authentication failed: wrong key or tampered ciphertext")
         
         return DecryptionResult(
             plaintext=plaintext.decode('utf-8'),
@@ -176,15 +205,15 @@ class AESEncryptor:
         key = self._get_aes_key(key_size)
         data = plaintext.encode('utf-8')
         
-        encrypted = bytes([d ^ key[i % len(key)] for i, d in enumerate(data)])
-        iv = os.urandom(16) if CRYPTO_AVAILABLE else bytes([0] * 16)
+        encrypted = _xor_with_key(data, key)
+        iv = os.urandom(GCM_IV_BYTES) if CRYPTO_AVAILABLE else bytes(GCM_IV_BYTES)
         
         return EncryptionResult(
             ciphertext=base64.b64encode(encrypted).decode('utf-8'),
             iv=base64.b64encode(iv).decode('utf-8'),
             key_hash=self.get_key_hash(),
             algorithm=f"AES-{key_size} (mock)",
-            mode="CBC (mock)",
+            mode="GCM (mock)",
             original_length=len(plaintext)
         )
     
@@ -193,7 +222,7 @@ class AESEncryptor:
         key = self._get_aes_key(key_size)
         encrypted = base64.b64decode(ciphertext_b64)
         
-        decrypted = bytes([d ^ key[i % len(key)] for i, d in enumerate(encrypted)])
+        decrypted = _xor_with_key(encrypted, key)
         
         return DecryptionResult(
             plaintext=decrypted.decode('utf-8'),
@@ -235,12 +264,6 @@ class PrivacyAmplification:
         if qber >= 0.11:  # Above theoretical limit
             return 0
         
-        # Binary entropy function
-        def binary_entropy(p: float) -> float:
-            if p <= 0 or p >= 1:
-                return 0
-            return -p * (p if p == 0 else __import__('math').log2(p)) - (1-p) * ((1-p) if (1-p) == 0 else __import__('math').log2(1-p))
-        
         # Shannon limit for key rate
         key_rate = 1 - 2 * binary_entropy(qber)
         
@@ -251,6 +274,34 @@ class PrivacyAmplification:
         
         return max(0, secure_length)
     
+    @staticmethod
+    def calculate_secure_lengths(
+        raw_key_lengths: np.ndarray,
+        qbers: np.ndarray
+    ) -> np.ndarray:
+        """
+        Batch version of calculate_secure_length for parameter sweeps.
+        
+        Args:
+            raw_key_lengths: Sifted key lengths (broadcast against qbers)
+            qbers: QBER values (0-1)
+            
+        Returns:
+            int64 array of secure key lengths
+        """
+        raw = np.asarray(raw_key_lengths, dtype=np.int64)
+        q = np.asarray(qbers, dtype=np.float64)
+        if _kernels.NUMBA_AVAILABLE:
+            return _kernels.secure_lengths(raw, q)
+        
+        # NumPy fallback: same formula, masked where the scalar path returns 0
+        inner = (q > 0) & (q < 0.11)
+        p = np.where(inner, q, 0.5)
+        h = np.where(inner, -p * np.log2(p) - (1 - p) * np.log2(1 - p), 0.0)
+        key_rate = 1 - 2 * h
+        lengths = np.trunc(raw * key_rate * 0.9).astype(np.int64)
+        return np.where((q < 0.11) & (key_rate > 0), np.maximum(lengths, 0), 0)
+    
     @staticmethod
     def amplify(
         raw_key: list[int],
@@ -285,22 +336,14 @@ class PrivacyAmplification:
             }
         
         # Use SHA-256 as a universal hash function
-        key_bytes = bytes([
-            sum(raw_key[i+j] << (7-j) for j in range(min(8, len(raw_key)-i)))
-            for i in range(0, len(raw_key), 8)
-        ])
+        key_bytes = np.packbits(np.asarray(raw_key, dtype=np.uint8)).tobytes()
         
         hash_output = hashlib.sha256(key_bytes).digest()
         
         # Convert to bits and truncate to target length
-        amplified_bits = []
-        for byte in hash_output:
-            for j in range(8):
-                if len(amplified_bits) >= target_length:
-                    break
-                amplified_bits.append((byte >> (7-j)) & 1)
-            if len(amplified_bits) >= target_length:
-                break
+        amplified_bits = np.unpackbits(
+            np.frombuffer(hash_output, dtype=np.uint8)
+        )[:target_length].tolist()
         
         return amplified_bits[:target_length], {
             "success": True,
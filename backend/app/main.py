@@ -3,19 +3,29 @@ FastAPI Application Entry Point
 QKD Simulator - Quantum Key Distribution Simulator
 """
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.core.config import settings
+from app.core.cache import close_redis, init_redis
 from app.core.database import init_db
+from app.core.errors import SimulationError
+from app.core.responses import ORJSONResponse
 from app.api.v1.router import api_router
+from app.services.history_service import drain_pending_writes
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database tables on startup."""
+    """Initialize database and Redis on startup, flush history writes on shutdown."""
     await init_db()
+    await init_redis()
     yield
+    await drain_pending_writes()
+    await close_redis()
 
 
 def create_application() -> FastAPI:
@@ -28,6 +38,7 @@ def create_application() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Configure CORS
@@ -39,6 +50,14 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress large simulation payloads (circuit JSON, bit arrays)
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+    @app.exception_handler(SimulationError)
+    async def simulation_error_handler(request: Request, exc: SimulationError):
+        """Report unexpected simulation errors as a 500 with the cause."""
+        return JSONResponse(status_code=500, content={"detail": exc.detail})
+
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -47,18 +66,22 @@ def create_application() -> FastAPI:
 
 app = create_application()
 
+# Static payloads are encoded once at import and served as raw bytes
+_ROOT_BODY = orjson.dumps({
+    "message": "QKD Simulator API",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
 
 @app.get("/")
 async def root():
     """Root endpoint - health check."""
-    return {
-        "message": "QKD Simulator API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -3,26 +3,55 @@ SQLAlchemy ORM models for simulation history persistence.
 """
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Float, Boolean, Integer, DateTime, Text, JSON
+from sqlalchemy import String, Float, Boolean, Integer, DateTime, Text, JSON, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
+# Binary JSONB on PostgreSQL (no reparse on read, GIN-indexable),
+# plain JSON text elsewhere (SQLite)
+JSONDocument = JSON().with_variant(JSONB(astext_type=Text()), "postgresql")
+
 
 class SimulationHistory(Base):
     """Stores results of BB84 and E91 simulations."""
     __tablename__ = "simulation_history"
+    __table_args__ = (
+        # WHERE protocol = ? ORDER BY created_at DESC LIMIT n in one index scan
+        Index("ix_sim_history_protocol_created", "protocol", text("created_at DESC")),
+        # Same pattern for the is_secure / eve_attack filters; INCLUDE lets
+        # PostgreSQL check the remaining filters without a heap fetch
+        Index(
+            "ix_sim_history_secure_created",
+            "is_secure",
+            text("created_at DESC"),
+            postgresql_include=["protocol", "eve_attack", "qber"],
+        ),
+        Index(
+            "ix_sim_history_eve_created",
+            "eve_attack",
+            text("created_at DESC"),
+            postgresql_include=["protocol", "is_secure", "qber"],
+        ),
+        Index(
+            "ix_sim_history_full_result_gin",
+            "full_result",
+            postgresql_using="gin",
+            postgresql_ops={"full_result": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
     )
-    protocol: Mapped[str] = mapped_column(String(10), index=True)  # BB84 or E91
+    protocol: Mapped[str] = mapped_column(String(10))  # BB84 or E91
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
     )
 
     # Configuration used
-    config: Mapped[dict] = mapped_column(JSON)
+    config: Mapped[dict] = mapped_column(JSONDocument)
 
     # Key results
     is_secure: Mapped[bool] = mapped_column(Boolean)
@@ -42,7 +71,7 @@ class SimulationHistory(Base):
     execution_time_ms: Mapped[float] = mapped_column(Float, default=0.0)
 
     # Full result JSON for detailed viewing
-    full_result: Mapped[dict] = mapped_column(JSON)
+    full_result: Mapped[dict] = mapped_column(JSONDocument)
 
     # Optional label set by user
     label: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -2,10 +2,24 @@
 Pydantic Schemas for QKD Simulator API
 Defines request/response models for BB84 and E91 protocols.
 """
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional
+from pydantic import BaseModel, BeforeValidator, Field
 from enum import Enum
 
+import numpy as np
+
+
+def _ndarray_to_list(value):
+    """Convert NumPy arrays to lists once, at the response boundary."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+# List[int] fields that also accept the uint8/int64 arrays produced
+# by the protocol modules
+IntArray = Annotated[List[int], BeforeValidator(_ndarray_to_list)]
+
 
 # ============ Enums ============
 
@@ -72,15 +86,15 @@ class BB84SimulationResult(BaseModel):
     circuit_depth: int = Field(description="Depth of the quantum circuit")
     
     # Key Information
-    alice_bits: List[int] = Field(description="Alice's original random bits")
+    alice_bits: IntArray = Field(description="Alice's original random bits")
     alice_bases: List[str] = Field(description="Alice's encoding bases")
     bob_bases: List[str] = Field(description="Bob's measurement bases")
-    bob_measurements: List[int] = Field(description="Bob's raw measurement results")
+    bob_measurements: IntArray = Field(description="Bob's raw measurement results")
     
     # Sifted Keys
-    sifted_alice_key: List[int] = Field(description="Alice's key after basis reconciliation")
-    sifted_bob_key: List[int] = Field(description="Bob's key after basis reconciliation")
-    matching_indices: List[int] = Field(description="Indices where Alice and Bob used same basis")
+    sifted_alice_key: IntArray = Field(description="Alice's key after basis reconciliation")
+    sifted_bob_key: IntArray = Field(description="Bob's key after basis reconciliation")
+    matching_indices: IntArray = Field(description="Indices where Alice and Bob used same basis")
     
     # Eve Information (if attack enabled)
     eve_detected: bool = Field(description="Whether eavesdropping was detected")
@@ -0,0 +1,35 @@
+"""
+Compiled kernels for BB84 post-processing.
+Uses Numba when installed; callers must check NUMBA_AVAILABLE first.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(nogil=True, cache=True)
+    def sift(alice_bits, alice_bases, bob_measurements, bob_bases):
+        """
+        Single-pass sift over uint8 bits and basis codes.
+
+        Returns (alice_key, bob_key, matching_indices), trimmed to the
+        number of positions where the basis codes agree.
+        """
+        n = alice_bits.shape[0]
+        alice_key = np.empty(n, np.uint8)
+        bob_key = np.empty(n, np.uint8)
+        indices = np.empty(n, np.int64)
+        count = 0
+        for i in range(n):
+            if alice_bases[i] == bob_bases[i]:
+                alice_key[count] = alice_bits[i]
+                bob_key[count] = bob_measurements[i]
+                indices[count] = i
+                count += 1
+        return alice_key[:count], bob_key[:count], indices[:count]
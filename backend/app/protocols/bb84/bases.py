@@ -0,0 +1,33 @@
+"""
+BB84 Basis Encoding
+Integer codes for the measurement bases, so the protocol modules can
+compare bases as uint8 arrays instead of per-element str compares.
+"""
+from typing import List, Sequence, Union
+
+import numpy as np
+
+# Code -> name lookup table; a basis' code is its index here
+BASIS_NAMES = ("Z", "X", "D")
+BASIS_CODES = {name: code for code, name in enumerate(BASIS_NAMES)}
+
+_NAMES_LUT = np.array(BASIS_NAMES)
+
+
+def encode_bases(bases: Union[Sequence[str], np.ndarray]) -> np.ndarray:
+    """
+    Encode basis labels as a uint8 code array.
+    
+    Arrays that are already integer codes are returned unchanged, so
+    callers can encode once and pass the codes on.
+    """
+    if isinstance(bases, np.ndarray) and bases.dtype.kind in "ui":
+        return bases
+    return np.fromiter(
+        (BASIS_CODES[b] for b in bases), dtype=np.uint8, count=len(bases)
+    )
+
+
+def decode_bases(codes: np.ndarray) -> List[str]:
+    """Convert a uint8 code array back to basis labels."""
+    return _NAMES_LUT[codes].tolist()
@@ -2,17 +2,64 @@
 BB84 Quantum Circuit Builder
 Constructs quantum circuits for the BB84 QKD protocol.
 """
-import random
-from typing import List, Tuple, Dict, Any
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Optional
+
+import numpy as np
+
+from app.protocols.bb84.bases import BASIS_NAMES, encode_bases
 
 try:
     from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-    from qiskit_aer import AerSimulator
     QISKIT_AVAILABLE = True
 except ImportError:
     QISKIT_AVAILABLE = False
 
 
+@lru_cache(maxsize=32)
+def _empty_circuit(n_qubits: int) -> Any:
+    """Register skeleton for an n-qubit BB84 circuit; copy before use."""
+    qr = QuantumRegister(n_qubits, 'q')
+    cr = ClassicalRegister(n_qubits, 'c')
+    return QuantumCircuit(qr, cr)
+
+
+def _bob_outcome_table() -> np.ndarray:
+    """
+    Bob's result indexed by [alice_bit, alice_basis, bob_basis] codes:
+    the bit he reads, or -1 where his outcome is uniformly random.
+    """
+    table = np.full((2, len(BASIS_NAMES), len(BASIS_NAMES)), -1, dtype=np.int8)
+    for a, alice_basis in enumerate(BASIS_NAMES):
+        for b, bob_basis in enumerate(BASIS_NAMES):
+            if (alice_basis == "Z") == (bob_basis == "Z"):
+                table[:, a, b] = (0, 1)
+    return table
+
+
+_BOB_OUTCOME = _bob_outcome_table()
+
+
+# Gate (type, label) sequences for circuit_json, keyed by Alice's
+# (bit, basis) and Bob's basis. Immutable tables; every call builds
+# fresh dicts from them, so responses never share mutable state.
+_ALICE_BASIS_GATES = {
+    "Z": (),
+    "X": (("H", "X-basis"),),
+    "D": (("S", "D-basis"), ("H", "D-basis")),
+}
+_ALICE_GATES = {
+    (bit, basis): (("X", "Encode 1"),) * bit + basis_gates
+    for bit in (0, 1)
+    for basis, basis_gates in _ALICE_BASIS_GATES.items()
+}
+_BOB_GATES = {
+    "Z": (),
+    "X": (("H", "X-measure"),),
+    "D": (("H", "D-measure"), ("Sdg", "D-measure")),
+}
+
+
 class BB84CircuitBuilder:
     """
     Builds quantum circuits for BB84 protocol simulation.
@@ -26,30 +73,38 @@ class BB84CircuitBuilder:
     Security comes from basis mismatch detection.
     """
     
-    def __init__(self, n_qubits: int = 9, bases: List[str] = None):
+    def __init__(
+        self,
+        n_qubits: int = 9,
+        bases: List[str] = None,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Initialize the circuit builder.
         
         Args:
             n_qubits: Number of qubits to use (1-20)
             bases: List of bases to use ("Z", "X", "D")
+            rng: Random generator for bits and bases (PCG64 by default);
+                share it with the Eve attack to make a run reproducible
         """
         self.n_qubits = n_qubits
         self.bases = bases or ["Z", "X"]
-        self.simulator = AerSimulator() if QISKIT_AVAILABLE else None
+        # Basis population as an array, so draws map indices in one step
+        self._bases_lut = np.array(self.bases)
+        self.rng = rng if rng is not None else np.random.default_rng()
         
-    def generate_alice_data(self) -> Tuple[List[int], List[str]]:
+    def generate_alice_data(self) -> Tuple[np.ndarray, List[str]]:
         """
         Generate Alice's random bits and encoding bases.
         
         Returns:
             Tuple of (bits, bases) where:
-            - bits: Random 0/1 values Alice will encode
+            - bits: Random 0/1 values Alice will encode (uint8 array)
             - bases: Random bases Alice will use for encoding
         """
-        bits = [random.randint(0, 1) for _ in range(self.n_qubits)]
-        bases = [random.choice(self.bases) for _ in range(self.n_qubits)]
-        return bits, bases
+        bits = self.rng.integers(0, 2, size=self.n_qubits, dtype=np.uint8)
+        return bits, self._draw_bases()
     
     def generate_bob_bases(self) -> List[str]:
         """
@@ -58,7 +113,12 @@ class BB84CircuitBuilder:
         Returns:
             List of random bases Bob will use for measurement
         """
-        return [random.choice(self.bases) for _ in range(self.n_qubits)]
+        return self._draw_bases()
+    
+    def _draw_bases(self) -> List[str]:
+        """Draw n_qubits bases uniformly from the configured set."""
+        choices = self.rng.integers(0, len(self.bases), size=self.n_qubits)
+        return self._bases_lut[choices].tolist()
     
     def build_circuit(
         self,
@@ -87,29 +147,40 @@ class BB84CircuitBuilder:
         if not QISKIT_AVAILABLE:
             return self._build_mock_circuit(alice_bits, alice_bases, bob_bases)
         
-        # Create quantum and classical registers
-        qr = QuantumRegister(self.n_qubits, 'q')
-        cr = ClassicalRegister(self.n_qubits, 'c')
-        circuit = QuantumCircuit(qr, cr)
+        # Start from a copy of the cached register skeleton
+        circuit = _empty_circuit(self.n_qubits).copy()
+        qr = circuit.qregs[0]
+        cr = circuit.cregs[0]
+        
+        # Track depth as layers are appended: the barrier aligns all
+        # qubits, so depth = deepest Alice qubit + deepest Bob qubit
+        alice_depth = 0
+        bob_depth = 0
         
         # === Alice's Preparation ===
         for i in range(self.n_qubits):
             bit = alice_bits[i]
             basis = alice_bases[i]
+            qubit_depth = 0
             
             # Encode the bit value
             if bit == 1:
                 circuit.x(qr[i])
+                qubit_depth += 1
             
             # Apply basis transformation
             if basis == "X":
                 # Hadamard basis: |+⟩ = H|0⟩, |-⟩ = H|1⟩
                 circuit.h(qr[i])
+                qubit_depth += 1
             elif basis == "D":
                 # Diagonal basis: S gate + Hadamard
                 circuit.s(qr[i])
                 circuit.h(qr[i])
+                qubit_depth += 2
             # Z basis: No additional gate needed
+            
+            alice_depth = max(alice_depth, qubit_depth)
         
         # Transmission barrier (for visualization)
         circuit.barrier()
@@ -121,19 +192,25 @@ class BB84CircuitBuilder:
             # Transform to measurement basis before measuring
             if basis == "X":
                 circuit.h(qr[i])
+                bob_depth = max(bob_depth, 2)
             elif basis == "D":
                 circuit.h(qr[i])
                 circuit.sdg(qr[i])  # S-dagger to undo Alice's S
-            # Z basis: Measure directly
+                bob_depth = max(bob_depth, 3)
+            else:
+                # Z basis: Measure directly
+                bob_depth = max(bob_depth, 1)
             
             circuit.measure(qr[i], cr[i])
         
         # Convert circuit to JSON for frontend visualization
-        circuit_json = self._circuit_to_json(circuit, alice_bits, alice_bases, bob_bases)
+        circuit_json = self._circuit_to_json(
+            alice_bits, alice_bases, bob_bases, depth=alice_depth + bob_depth
+        )
         
         return circuit, circuit_json
     
-    def execute(self, circuit: Any, shots: int = 1024) -> List[int]:
+    def execute(self, circuit: Any, shots: int = 1024) -> np.ndarray:
         """
         Execute the quantum circuit and return Bob's measurements.
         
@@ -142,31 +219,69 @@ class BB84CircuitBuilder:
             shots: Number of measurement shots
             
         Returns:
-            List of Bob's measurement results (most frequent outcome)
+            uint8 array of Bob's measurement results (most frequent
+            outcome per qubit)
         """
         if not QISKIT_AVAILABLE:
             return self._mock_execute(shots)
         
-        # Run simulation
-        job = self.simulator.run(circuit, shots=shots)
-        result = job.result()
-        counts = result.get_counts()
-        
-        # Get most frequent measurement outcome
-        most_frequent = max(counts, key=counts.get)
+        # Every qubit is prepared and measured on its own (a product
+        # state, with only terminal measurements), so evolve each qubit's
+        # 2-amplitude state through its gates instead of simulating the
+        # full register shot by shot
+        amplitudes = np.zeros((self.n_qubits, 2), dtype=complex)
+        amplitudes[:, 0] = 1.0
+        for instruction in circuit.data:
+            name = instruction.operation.name
+            if name in ("barrier", "measure"):
+                continue
+            i = circuit.find_bit(instruction.qubits[0]).index
+            amplitudes[i] = instruction.operation.to_matrix() @ amplitudes[i]
+        p_one = np.abs(amplitudes[:, 1]) ** 2
         
-        # Reverse bit string (Qiskit uses little-endian)
-        # Convert to list of integers
-        measurements = [int(b) for b in reversed(most_frequent)]
+        # Sample all shots per qubit in one binomial draw and keep the
+        # most frequent outcome (ties broken by a fair coin)
+        ones = self.rng.binomial(shots, np.clip(p_one, 0.0, 1.0))
+        ties = 2 * ones == shots
+        measurements = (2 * ones > shots).astype(np.uint8)
+        measurements[ties] = self.rng.integers(0, 2, size=int(ties.sum()), dtype=np.uint8)
         
         return measurements
     
-    def _circuit_to_json(
+    def measure_analytic(
         self,
-        circuit: Any,
         alice_bits: List[int],
         alice_bases: List[str],
         bob_bases: List[str]
+    ) -> np.ndarray:
+        """
+        Bob's measurements computed directly from the preparation.
+        
+        Every qubit is independent, so no simulation is needed. Alice's
+        basis gates are undone by Bob's whenever both measure in Z or
+        both in a non-Z basis (X and D differ only by a phase), and Bob
+        reads her bit exactly. A Z basis against X or D leaves him with a
+        uniformly random bit. This matches the distribution of execute();
+        the cases are tabulated in _BOB_OUTCOME.
+        
+        Returns:
+            uint8 array of Bob's measurement results
+        """
+        outcomes = _BOB_OUTCOME[
+            np.asarray(alice_bits, dtype=np.uint8),
+            encode_bases(alice_bases),
+            encode_bases(bob_bases),
+        ]
+        is_random = outcomes < 0
+        outcomes[is_random] = self.rng.integers(0, 2, size=int(is_random.sum()))
+        return outcomes.astype(np.uint8)
+    
+    def _circuit_to_json(
+        self,
+        alice_bits: List[int],
+        alice_bases: List[str],
+        bob_bases: List[str],
+        depth: int
     ) -> Dict:
         """
         Convert quantum circuit to JSON for frontend visualization.
@@ -174,88 +289,32 @@ class BB84CircuitBuilder:
         Returns a structured representation suitable for rendering.
         """
         gates = []
+        bits = np.asarray(alice_bits).tolist()
         
-        # Add Alice's preparation gates
-        for i in range(self.n_qubits):
-            bit = alice_bits[i]
-            basis = alice_bases[i]
-            
-            if bit == 1:
-                gates.append({
-                    "type": "X",
-                    "targets": [i],
-                    "section": "alice",
-                    "label": "Encode 1"
-                })
-            
-            if basis == "X":
-                gates.append({
-                    "type": "H",
-                    "targets": [i],
-                    "section": "alice",
-                    "label": "X-basis"
-                })
-            elif basis == "D":
-                gates.append({
-                    "type": "S",
-                    "targets": [i],
-                    "section": "alice",
-                    "label": "D-basis"
-                })
-                gates.append({
-                    "type": "H",
-                    "targets": [i],
-                    "section": "alice",
-                    "label": "D-basis"
-                })
-        
-        # Add barrier
+        # Alice's preparation gates, then the barrier, then Bob's
+        # measurement gates, looked up per qubit in the gate tables
+        for i, (bit, basis) in enumerate(zip(bits, alice_bases)):
+            for gate_type, label in _ALICE_GATES[bit, basis]:
+                gates.append({"type": gate_type, "targets": [i], "section": "alice", "label": label})
         gates.append({
             "type": "BARRIER",
             "targets": list(range(self.n_qubits)),
             "section": "transmission"
         })
-        
-        # Add Bob's measurement gates
-        for i in range(self.n_qubits):
-            basis = bob_bases[i]
-            
-            if basis == "X":
-                gates.append({
-                    "type": "H",
-                    "targets": [i],
-                    "section": "bob",
-                    "label": "X-measure"
-                })
-            elif basis == "D":
-                gates.append({
-                    "type": "H",
-                    "targets": [i],
-                    "section": "bob",
-                    "label": "D-measure"
-                })
-                gates.append({
-                    "type": "Sdg",
-                    "targets": [i],
-                    "section": "bob",
-                    "label": "D-measure"
-                })
-            
-            gates.append({
-                "type": "MEASURE",
-                "targets": [i],
-                "section": "bob"
-            })
+        for i, basis in enumerate(bob_bases):
+            for gate_type, label in _BOB_GATES[basis]:
+                gates.append({"type": gate_type, "targets": [i], "section": "bob", "label": label})
+            gates.append({"type": "MEASURE", "targets": [i], "section": "bob"})
         
         return {
             "n_qubits": self.n_qubits,
             "n_classical": self.n_qubits,
             "gates": gates,
-            "depth": circuit.depth() if QISKIT_AVAILABLE and hasattr(circuit, 'depth') else len(gates),
+            "depth": depth,
             "metadata": {
                 "protocol": "BB84",
                 "bases_used": self.bases,
-                "alice_bits": alice_bits,
+                "alice_bits": bits,
                 "alice_bases": alice_bases,
                 "bob_bases": bob_bases
             }
@@ -268,10 +327,11 @@ class BB84CircuitBuilder:
         bob_bases: List[str]
     ) -> Tuple[None, Dict]:
         """Build a mock circuit when Qiskit is not available."""
-        circuit_json = self._circuit_to_json(None, alice_bits, alice_bases, bob_bases)
-        circuit_json["depth"] = self.n_qubits * 3
+        circuit_json = self._circuit_to_json(
+            alice_bits, alice_bases, bob_bases, depth=self.n_qubits * 3
+        )
         return None, circuit_json
     
-    def _mock_execute(self, shots: int) -> List[int]:
+    def _mock_execute(self, shots: int) -> np.ndarray:
         """Mock execution when Qiskit is not available."""
-        return [random.randint(0, 1) for _ in range(self.n_qubits)]
+        return self.rng.integers(0, 2, size=self.n_qubits, dtype=np.uint8)
@@ -2,8 +2,85 @@
 BB84 Eve Attack Module
 Simulates eavesdropper's intercept-resend attack.
 """
-import random
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from app.protocols.bb84.bases import decode_bases, encode_bases
+
+
+def intercept(
+    rng: np.random.Generator,
+    alice_bits: List[int],
+    alice_bases: List[str],
+    bob_bases: List[str],
+    bob_measurements: List[int],
+    intercept_ratio: float = 1.0,
+    bases: List[str] = None
+) -> Dict:
+    """
+    Perform intercept-resend attack.
+    
+    Eve:
+    1. Randomly selects which qubits to intercept
+    2. Measures each intercepted qubit in a random basis
+    3. Re-prepares and sends based on her measurement
+    
+    If Eve's basis matches Alice's, Bob receives correct value.
+    If Eve's basis differs from Alice's, ~50% error introduced.
+    
+    Args:
+        rng: Random generator owned by this simulation run
+        alice_bits: Alice's original bits
+        alice_bases: Alice's encoding bases (labels or uint8 codes)
+        bob_bases: Bob's measurement bases (labels or uint8 codes)
+        bob_measurements: Bob's measurements. A uint8 array is updated
+            in place (copy it first to keep the original); a list is
+            left unchanged
+        intercept_ratio: Fraction of qubits Eve intercepts (0.0-1.0)
+        bases: Available bases for Eve's measurements
+        
+    Returns:
+        Dictionary with Eve's attack details and modified measurements
+    """
+    bases = bases or ["Z", "X"]
+    n = len(alice_bits)
+    
+    # Determine which qubits Eve intercepts
+    n_intercept = min(int(n * intercept_ratio), n)
+    idx = np.sort(rng.choice(n, size=n_intercept, replace=False))
+    
+    # Eve measures each intercepted qubit in a random basis
+    eve_bases = encode_bases(bases)[rng.integers(len(bases), size=n_intercept)]
+    same_as_alice = eve_bases == encode_bases(alice_bases)[idx]
+    
+    # Same basis as Alice: she reads the correct bit; otherwise a random one
+    eve_measurements = np.where(
+        same_as_alice,
+        np.asarray(alice_bits, dtype=np.uint8)[idx],
+        rng.integers(0, 2, size=n_intercept, dtype=np.uint8),
+    )
+    
+    # Eve re-prepares and resends. Where her basis differs from Bob's,
+    # his result is flipped half the time; where it matches Bob's but
+    # not Alice's, Bob reads Eve's (possibly wrong) measurement
+    in_place = isinstance(bob_measurements, np.ndarray) and bob_measurements.dtype == np.uint8
+    modified_bob = bob_measurements if in_place else np.array(bob_measurements, dtype=np.uint8)
+    diff_from_bob = eve_bases != encode_bases(bob_bases)[idx]
+    flip = diff_from_bob & (rng.random(n_intercept) < 0.5)
+    modified_bob[idx[flip]] ^= 1
+    resend = ~diff_from_bob & ~same_as_alice
+    modified_bob[idx[resend]] = eve_measurements[resend]
+    
+    return {
+        "intercepted_indices": idx.tolist(),
+        "eve_bases": decode_bases(eve_bases),
+        "eve_measurements": eve_measurements.tolist(),
+        "modified_bob_measurements": modified_bob if in_place else modified_bob.tolist(),
+        "eve_correct_guesses": int(same_as_alice.sum()),
+        "eve_intercept_count": n_intercept,
+        "intercept_ratio_actual": n_intercept / n if n > 0 else 0
+    }
 
 
 class EveAttacker:
@@ -32,87 +109,30 @@ class EveAttacker:
         self.n_qubits = n_qubits
         self.intercept_ratio = intercept_ratio
         self.bases = bases or ["Z", "X"]
+        self._expected_error_pct = self._expected_error(self.bases, intercept_ratio)
     
     def intercept(
         self,
         alice_bits: List[int],
         alice_bases: List[str],
         bob_bases: List[str],
-        bob_measurements: List[int]
+        bob_measurements: List[int],
+        rng: Optional[np.random.Generator] = None
     ) -> Dict:
         """
-        Perform intercept-resend attack.
-        
-        Eve:
-        1. Randomly selects which qubits to intercept
-        2. Measures each intercepted qubit in a random basis
-        3. Re-prepares and sends based on her measurement
-        
-        If Eve's basis matches Alice's, Bob receives correct value.
-        If Eve's basis differs from Alice's, ~50% error introduced.
-        
-        Args:
-            alice_bits: Alice's original bits
-            alice_bases: Alice's encoding bases
-            bob_bases: Bob's measurement bases
-            bob_measurements: Bob's original measurements (will be modified)
-            
-        Returns:
-            Dictionary with Eve's attack details and modified measurements
+        Perform intercept-resend attack with this attacker's settings.
+
+        See the module-level ``intercept`` for details.
         """
-        n = len(alice_bits)
-        
-        # Determine which qubits Eve intercepts
-        n_intercept = int(n * self.intercept_ratio)
-        intercepted_indices = random.sample(range(n), min(n_intercept, n))
-        intercepted_indices.sort()
-        
-        # Eve's random bases and measurements
-        eve_bases = []
-        eve_measurements = []
-        
-        # Modified Bob measurements after Eve's interference
-        modified_bob = bob_measurements.copy()
-        
-        # Track Eve's information gain
-        eve_correct_guesses = 0
-        
-        for i in intercepted_indices:
-            # Eve chooses a random basis to measure
-            eve_basis = random.choice(self.bases)
-            eve_bases.append(eve_basis)
-            
-            # Eve's measurement result
-            if eve_basis == alice_bases[i]:
-                # Eve used same basis as Alice - she gets correct value
-                eve_measurement = alice_bits[i]
-                eve_correct_guesses += 1
-            else:
-                # Eve used different basis - random result
-                eve_measurement = random.randint(0, 1)
-            
-            eve_measurements.append(eve_measurement)
-            
-            # Now Eve re-prepares the qubit and sends to Bob
-            # If Eve's basis differs from Bob's, introduces errors
-            if eve_basis != bob_bases[i]:
-                # Random error introduced
-                if random.random() < 0.5:
-                    modified_bob[i] = 1 - bob_measurements[i]  # Flip bit
-            elif eve_basis != alice_bases[i]:
-                # Eve's re-preparation based on wrong measurement
-                # Bob might get wrong value
-                modified_bob[i] = eve_measurement
-        
-        return {
-            "intercepted_indices": intercepted_indices,
-            "eve_bases": eve_bases,
-            "eve_measurements": eve_measurements,
-            "modified_bob_measurements": modified_bob,
-            "eve_correct_guesses": eve_correct_guesses,
-            "eve_intercept_count": len(intercepted_indices),
-            "intercept_ratio_actual": len(intercepted_indices) / n if n > 0 else 0
-        }
+        return intercept(
+            rng if rng is not None else np.random.default_rng(),
+            alice_bits=alice_bits,
+            alice_bases=alice_bases,
+            bob_bases=bob_bases,
+            bob_measurements=bob_measurements,
+            intercept_ratio=self.intercept_ratio,
+            bases=self.bases,
+        )
     
     def calculate_expected_error(self, alice_bases: List[str]) -> float:
         """
@@ -128,7 +148,12 @@ class EveAttacker:
         Returns:
             Expected QBER from attack
         """
-        n_bases = len(set(self.bases))
+        return self._expected_error_pct
+
+    @staticmethod
+    def _expected_error(bases: List[str], intercept_ratio: float) -> float:
+        """Expected QBER (percent); depends only on the attacker's settings."""
+        n_bases = len(set(bases))
         match_probability = 1 / n_bases
         
         # Error occurs when:
@@ -137,6 +162,6 @@ class EveAttacker:
         error_probability = (1 - match_probability) * 0.5
         
         # Apply intercept ratio
-        effective_error = error_probability * self.intercept_ratio
+        effective_error = error_probability * intercept_ratio
         
         return effective_error * 100  # Return as percentage
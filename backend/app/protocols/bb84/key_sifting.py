@@ -4,6 +4,11 @@ Performs basis reconciliation to extract matching key bits.
 """
 from typing import List, Dict
 
+import numpy as np
+
+from app.protocols.bb84 import _kernels
+from app.protocols.bb84.bases import encode_bases
+
 
 class KeySifter:
     """
@@ -36,28 +41,56 @@ class KeySifter:
             - bob_key: Bob's sifted key  
             - matching_indices: Indices where bases matched
             - efficiency: Ratio of sifted bits to total bits
+            
+        Inputs are sifted in one vectorized pass. NumPy array inputs
+        return arrays; list inputs return lists.
         """
-        alice_key = []
-        bob_key = []
-        matching_indices = []
+        if isinstance(alice_bits, np.ndarray):
+            return self._sift_arrays(alice_bits, alice_bases, bob_measurements, bob_bases)
         
+        # Lists take the same vectorized path and convert back at the end
+        result = self._sift_arrays(
+            np.asarray(alice_bits), alice_bases, bob_measurements, bob_bases
+        )
+        for field in ("alice_key", "bob_key", "matching_indices"):
+            result[field] = result[field].tolist()
+        return result
+    
+    def _sift_arrays(
+        self,
+        alice_bits: np.ndarray,
+        alice_bases: List[str],
+        bob_measurements: np.ndarray,
+        bob_bases: List[str]
+    ) -> Dict:
+        """
+        Vectorized sifting for array inputs.
+
+        Bases may be labels or uint8 codes and are compared as codes:
+        in a compiled single-pass loop with Numba installed, otherwise
+        with a NumPy boolean mask.
+        """
         n_qubits = len(alice_bits)
-        
-        for i in range(n_qubits):
-            # Only keep bits where Alice and Bob used the same basis
-            if alice_bases[i] == bob_bases[i]:
-                alice_key.append(alice_bits[i])
-                bob_key.append(bob_measurements[i])
-                matching_indices.append(i)
-        
-        # Calculate sifting efficiency
-        efficiency = len(alice_key) / n_qubits if n_qubits > 0 else 0.0
+        alice_codes = encode_bases(alice_bases)
+        bob_codes = encode_bases(bob_bases)
+        if _kernels.NUMBA_AVAILABLE:
+            alice_key, bob_key, matching_indices = _kernels.sift(
+                np.asarray(alice_bits, dtype=np.uint8),
+                alice_codes,
+                np.asarray(bob_measurements, dtype=np.uint8),
+                bob_codes,
+            )
+        else:
+            mask = alice_codes == bob_codes
+            alice_key = alice_bits[mask]
+            bob_key = np.asarray(bob_measurements)[mask]
+            matching_indices = np.flatnonzero(mask)
         
         return {
             "alice_key": alice_key,
             "bob_key": bob_key,
             "matching_indices": matching_indices,
-            "efficiency": efficiency,
+            "efficiency": len(alice_key) / n_qubits if n_qubits > 0 else 0.0,
             "total_bits": n_qubits,
             "sifted_bits": len(alice_key)
         }
@@ -88,10 +121,9 @@ class KeySifter:
                 "bob_length": len(bob_key)
             }
         
-        mismatches = []
-        for i in range(len(alice_key)):
-            if alice_key[i] != bob_key[i]:
-                mismatches.append(i)
+        mismatches = np.flatnonzero(
+            np.asarray(alice_key) != np.asarray(bob_key)
+        ).tolist()
         
         match_rate = 1.0 - (len(mismatches) / len(alice_key)) if len(alice_key) > 0 else 0.0
         
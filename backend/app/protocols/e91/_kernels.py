@@ -0,0 +1,33 @@
+"""
+Compiled kernels for E91 correlation analysis.
+Uses Numba when installed; callers must check NUMBA_AVAILABLE first.
+"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(nogil=True, cache=True)
+    def same_minus_different(bits, weights, n_pairs):
+        """
+        Weighted (same - different) pair outcomes over count rows.
+
+        bits holds one row of 0/1 values per bitstring in Qiskit's
+        little-endian character order: classical bit j sits in column
+        width - 1 - j. Pair i is Alice's bit 2i against Bob's bit 2i+1.
+        """
+        width = bits.shape[1]
+        total = 0
+        for r in range(bits.shape[0]):
+            agreement = 0
+            for i in range(n_pairs):
+                if bits[r, width - 1 - 2 * i] == bits[r, width - 2 - 2 * i]:
+                    agreement += 1
+                else:
+                    agreement -= 1
+            total += weights[r] * agreement
+        return total
@@ -3,7 +3,43 @@ CHSH Inequality Validator
 Tests Bell's inequality to detect eavesdropping.
 """
 import math
-from typing import Dict, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+
+
+# Security interpretations by S band. Read-only views, shared by every
+# call; copy with dict(...) if a mutable result is needed.
+_SECURE_RESULT = MappingProxyType({
+    "status": "secure",
+    "message": "Strong quantum violation detected",
+    "explanation": "Correlations are genuinely quantum - no eavesdropper",
+    "confidence": "high",
+    "color": "green"
+})
+_MARGINAL_RESULT = MappingProxyType({
+    "status": "marginal",
+    "message": "Weak quantum violation detected",
+    "explanation": "Some quantum correlations present, but noise or partial eavesdropping possible",
+    "confidence": "medium",
+    "color": "yellow"
+})
+_SUSPICIOUS_RESULT = MappingProxyType({
+    "status": "suspicious",
+    "message": "Below classical bound but non-zero correlations",
+    "explanation": "Possible eavesdropping or severe decoherence",
+    "confidence": "low",
+    "color": "orange"
+})
+_INSECURE_RESULT = MappingProxyType({
+    "status": "insecure",
+    "message": "No quantum violation - channel compromised",
+    "explanation": "Classical correlations only - eavesdropper present",
+    "confidence": "high",
+    "color": "red"
+})
 
 
 class CHSHValidator:
@@ -37,70 +73,26 @@ class CHSHValidator:
         Returns:
             Dictionary with S-parameter and detailed breakdown
         """
-        # Extract expectation values
+        # Extract expectation values and index correlations by angle
+        # pair in one pass over the measurements
         expectation_values = {}
+        by_angles = {}
         
-        for key, data in correlations.items():
+        for data in correlations.values():
             a_angle = data.get("alice_angle", 0)
             b_angle = data.get("bob_angle", 0)
             corr = data.get("correlation", 0)
             expectation_values[f"E({a_angle},{b_angle})"] = corr
+            by_angles[(a_angle, b_angle)] = corr
         
         # Find angle combinations for CHSH
         # Standard optimal angles: a=0, a'=45, b=22.5, b'=67.5
         # But we'll use available angles
         
-        available_alice = set()
-        available_bob = set()
+        available_alice = {a_angle for a_angle, _ in by_angles}
+        available_bob = {b_angle for _, b_angle in by_angles}
         
-        for key, data in correlations.items():
-            available_alice.add(data.get("alice_angle", 0))
-            available_bob.add(data.get("bob_angle", 0))
-        
-        alice_angles = sorted(list(available_alice))
-        bob_angles = sorted(list(available_bob))
-        
-        # Calculate S-parameter using available angles
-        # For maximum CHSH violation with angles [0,45,90] and [45,90,135]:
-        # Use: a=0, a'=90, b=45, b'=135 → gives S ≈ 2√2
-        if len(alice_angles) >= 2 and len(bob_angles) >= 2:
-            # Select angles for maximum violation
-            # Alice: use first and last (0, 90) for maximum spread
-            # Bob: use first and last (45, 135) for maximum spread
-            a = alice_angles[0]  # 0°
-            a_prime = alice_angles[-1] if len(alice_angles) > 2 else alice_angles[1]  # 90° or 45°
-            b = bob_angles[0]  # 45°
-            b_prime = bob_angles[-1] if len(bob_angles) > 2 else bob_angles[1]  # 135° or 90°
-
-            E_ab = self._get_correlation(correlations, a, b)
-            E_ab_prime = self._get_correlation(correlations, a, b_prime)
-            E_a_prime_b = self._get_correlation(correlations, a_prime, b)
-            E_a_prime_b_prime = self._get_correlation(correlations, a_prime, b_prime)
-
-            # CHSH formula: S = |E(a,b) - E(a,b') + E(a',b) + E(a',b')|
-            # Note: The sign pattern matters for maximum violation
-            S = abs(E_ab - E_ab_prime + E_a_prime_b + E_a_prime_b_prime)
-            
-            return {
-                "s_parameter": round(S, 4),
-                "violates_classical": S > self.CLASSICAL_BOUND,
-                "classical_bound": self.CLASSICAL_BOUND,
-                "quantum_max": round(self.QUANTUM_MAX, 4),
-                "angles_used": {
-                    "a": a,
-                    "a_prime": a_prime,
-                    "b": b,
-                    "b_prime": b_prime
-                },
-                "expectation_values": expectation_values,
-                "terms": {
-                    "E(a,b)": E_ab,
-                    "E(a,b')": E_ab_prime,
-                    "E(a',b)": E_a_prime_b,
-                    "E(a',b')": E_a_prime_b_prime
-                }
-            }
-        else:
+        if len(available_alice) < 2 or len(available_bob) < 2:
             # Not enough angles for proper CHSH test
             return {
                 "s_parameter": 0.0,
@@ -110,26 +102,45 @@ class CHSHValidator:
                 "classical_bound": self.CLASSICAL_BOUND,
                 "quantum_max": round(self.QUANTUM_MAX, 4)
             }
-    
-    def _get_correlation(
-        self,
-        correlations: Dict,
-        alice_angle: float,
-        bob_angle: float
-    ) -> float:
-        """Get correlation for specific angle pair."""
-        key = f"({alice_angle},{bob_angle})"
-        
-        if key in correlations:
-            return correlations[key].get("correlation", 0)
         
-        # Try to find closest match
-        for k, data in correlations.items():
-            if (data.get("alice_angle") == alice_angle and 
-                data.get("bob_angle") == bob_angle):
-                return data.get("correlation", 0)
-        
-        return 0.0
+        # Calculate S-parameter using available angles
+        # For maximum CHSH violation with angles [0,45,90] and [45,90,135]:
+        # Use: a=0, a'=90, b=45, b'=135 → gives S ≈ 2√2
+        # Select angles for maximum violation: the first and last of each
+        # side's sorted angles, i.e. its min and max (no sort needed)
+        # Alice: (0, 90) for maximum spread
+        # Bob: (45, 135) for maximum spread
+        a, a_prime = min(available_alice), max(available_alice)
+        b, b_prime = min(available_bob), max(available_bob)
+
+        E_ab = by_angles.get((a, b), 0.0)
+        E_ab_prime = by_angles.get((a, b_prime), 0.0)
+        E_a_prime_b = by_angles.get((a_prime, b), 0.0)
+        E_a_prime_b_prime = by_angles.get((a_prime, b_prime), 0.0)
+
+        # CHSH formula: S = |E(a,b) - E(a,b') + E(a',b) + E(a',b')|
+        # Note: The sign pattern matters for maximum violation
+        S = abs(E_ab - E_ab_prime + E_a_prime_b + E_a_prime_b_prime)
+        
+        return {
+            "s_parameter": round(S, 4),
+            "violates_classical": S > self.CLASSICAL_BOUND,
+            "classical_bound": self.CLASSICAL_BOUND,
+            "quantum_max": round(self.QUANTUM_MAX, 4),
+            "angles_used": {
+                "a": a,
+                "a_prime": a_prime,
+                "b": b,
+                "b_prime": b_prime
+            },
+            "expectation_values": expectation_values,
+            "terms": {
+                "E(a,b)": E_ab,
+                "E(a,b')": E_ab_prime,
+                "E(a',b)": E_a_prime_b,
+                "E(a',b')": E_a_prime_b_prime
+            }
+        }
     
     def get_theoretical_s(
         self,
@@ -154,20 +165,44 @@ class CHSHValidator:
         if bob_angles is None:
             bob_angles = [22.5, 67.5]
         
-        a, a_prime = math.radians(alice_angles[0]), math.radians(alice_angles[1])
-        b, b_prime = math.radians(bob_angles[0]), math.radians(bob_angles[1])
+        return self._theoretical_s(tuple(alice_angles[:2]), tuple(bob_angles[:2]))
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _theoretical_s(alice_pair: Tuple[float, float], bob_pair: Tuple[float, float]) -> float:
+        """Rounded theoretical S for one angle pair each; cached for sweeps."""
+        S = CHSHValidator.get_theoretical_s_batch([alice_pair], [bob_pair])[0, 0]
+        return round(float(S), 4)
+    
+    @staticmethod
+    def get_theoretical_s_batch(
+        alice_pairs: np.ndarray,
+        bob_pairs: np.ndarray
+    ) -> np.ndarray:
+        """
+        Theoretical S-parameter for every combination of angle pairs.
         
-        # Quantum correlation: E(θ_a, θ_b) = -cos(θ_a - θ_b)
-        E_ab = -math.cos(a - b)
-        E_ab_prime = -math.cos(a - b_prime)
-        E_a_prime_b = -math.cos(a_prime - b)
-        E_a_prime_b_prime = -math.cos(a_prime - b_prime)
+        Args:
+            alice_pairs: Array of shape (N, 2) holding [a, a'] in degrees
+            bob_pairs: Array of shape (M, 2) holding [b, b'] in degrees
+            
+        Returns:
+            Array of shape (N, M) of unrounded S values
+        """
+        alice = np.deg2rad(np.asarray(alice_pairs, dtype=np.float64))
+        bob = np.deg2rad(np.asarray(bob_pairs, dtype=np.float64))
+        a, a_prime = alice[:, 0, None], alice[:, 1, None]
+        b, b_prime = bob[None, :, 0], bob[None, :, 1]
         
-        S = abs(E_ab + E_ab_prime + E_a_prime_b - E_a_prime_b_prime)
+        # Quantum correlation: E(θ_a, θ_b) = -cos(θ_a - θ_b)
+        E_ab = -np.cos(a - b)
+        E_ab_prime = -np.cos(a - b_prime)
+        E_a_prime_b = -np.cos(a_prime - b)
+        E_a_prime_b_prime = -np.cos(a_prime - b_prime)
         
-        return round(S, 4)
+        return np.abs(E_ab + E_ab_prime + E_a_prime_b - E_a_prime_b_prime)
     
-    def interpret_result(self, s_parameter: float) -> Dict:
+    def interpret_result(self, s_parameter: float) -> Mapping[str, str]:
         """
         Interpret CHSH result for security assessment.
         
@@ -175,37 +210,13 @@ class CHSHValidator:
             s_parameter: Calculated S value
             
         Returns:
-            Security interpretation
+            Security interpretation (a shared read-only mapping)
         """
         if s_parameter > 2.5:
-            return {
-                "status": "secure",
-                "message": "Strong quantum violation detected",
-                "explanation": "Correlations are genuinely quantum - no eavesdropper",
-                "confidence": "high",
-                "color": "green"
-            }
+            return _SECURE_RESULT
         elif s_parameter > self.CLASSICAL_BOUND:
-            return {
-                "status": "marginal",
-                "message": "Weak quantum violation detected",
-                "explanation": "Some quantum correlations present, but noise or partial eavesdropping possible",
-                "confidence": "medium",
-                "color": "yellow"
-            }
+            return _MARGINAL_RESULT
         elif s_parameter > 1.5:
-            return {
-                "status": "suspicious",
-                "message": "Below classical bound but non-zero correlations",
-                "explanation": "Possible eavesdropping or severe decoherence",
-                "confidence": "low",
-                "color": "orange"
-            }
+            return _SUSPICIOUS_RESULT
         else:
-            return {
-                "status": "insecure",
-                "message": "No quantum violation - channel compromised",
-                "explanation": "Classical correlations only - eavesdropper present",
-                "confidence": "high",
-                "color": "red"
-            }
+            return _INSECURE_RESULT
@@ -2,12 +2,17 @@
 E91 Entanglement Generator Module
 Creates EPR pairs and Bell states for E91 protocol.
 """
-import random
 import math
+from functools import lru_cache
 from typing import List, Tuple, Dict, Any
 
+import numpy as np
+
+from app.protocols.e91 import _kernels
+
 try:
-    from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+    from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
+    from qiskit.circuit import Parameter
     from qiskit_aer import AerSimulator
     from qiskit_aer.noise import NoiseModel, depolarizing_error
     QISKIT_AVAILABLE = True
@@ -15,6 +20,67 @@ except ImportError:
     QISKIT_AVAILABLE = False
 
 
+@lru_cache(maxsize=32)
+def _measurement_layer(n_pairs: int) -> Tuple[Any, Any, Any]:
+    """
+    Rotate-and-measure layer for n_pairs Bell pairs, parameterized by
+    Alice's and Bob's angles (radians) and transpiled once per size.
+
+    Returns:
+        Tuple of (compiled circuit, alice parameter, bob parameter);
+        bind parameters into a new circuit rather than mutating it.
+    """
+    theta_a = Parameter("theta_a")
+    theta_b = Parameter("theta_b")
+    n_qubits = n_pairs * 2
+    layer = QuantumCircuit(QuantumRegister(n_qubits, 'q'), ClassicalRegister(n_qubits, 'c'))
+    for i in range(n_pairs):
+        alice_qubit = 2 * i
+        bob_qubit = 2 * i + 1
+        layer.ry(-theta_a, alice_qubit)
+        layer.ry(-theta_b, bob_qubit)
+        layer.measure(alice_qubit, alice_qubit)
+        layer.measure(bob_qubit, bob_qubit)
+    compiled = transpile(layer, AerSimulator(), optimization_level=0)
+    return compiled, theta_a, theta_b
+
+
+@lru_cache(maxsize=32)
+def _noise_model(noise_level: float) -> Any:
+    """Depolarizing noise on the H and RY gates; shared, do not modify."""
+    noise_model = NoiseModel()
+    error = depolarizing_error(noise_level, 1)
+    noise_model.add_all_qubit_quantum_error(error, ['h', 'ry'])
+    return noise_model
+
+
+@lru_cache(maxsize=32)
+def _bell_gates(n_pairs: int) -> Tuple[Tuple[str, Tuple[int, ...], str], ...]:
+    """
+    (type, targets, label) of the H + CNOT gates preparing n_pairs Bell
+    pairs. Immutable; _circuit_to_json builds fresh dicts from it, so
+    responses never share mutable state.
+    """
+    gates = []
+    for i in range(n_pairs):
+        alice_qubit = 2 * i
+        bob_qubit = 2 * i + 1
+        gates.append(("H", (alice_qubit,), "Bell state"))
+        gates.append(("CNOT", (alice_qubit, bob_qubit), "Entangle"))
+    return tuple(gates)
+
+
+def _counts_bits(counts: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a counts dict into a uint8 matrix with one row of 0/1 values
+    per outcome (in bitstring character order) and its int64 counts.
+    """
+    bits = np.frombuffer("".join(counts).encode(), dtype=np.uint8)
+    bits = bits.reshape(len(counts), -1) - ord("0")
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    return bits, weights
+
+
 class EntanglementGenerator:
     """
     Generates entangled Bell states for E91 QKD protocol.
@@ -73,7 +139,7 @@ class EntanglementGenerator:
         circuit.barrier()
         
         # Convert to JSON for visualization
-        circuit_json = self._circuit_to_json(circuit)
+        circuit_json = self._circuit_to_json()
         
         return circuit, circuit_json
     
@@ -100,54 +166,43 @@ class EntanglementGenerator:
             return self._mock_correlations(alice_angles, bob_angles)
         
         correlations = {}
-        
-        for a_angle in alice_angles:
-            for b_angle in bob_angles:
-                key = f"({a_angle},{b_angle})"
-                
-                # Create measurement circuit for this angle pair
-                meas_circuit = circuit.copy()
-                
-                # Apply rotation gates before measurement
-                for i in range(self.n_pairs):
-                    alice_qubit = 2 * i
-                    bob_qubit = 2 * i + 1
-                    
-                    # Rotate Alice's qubit
-                    a_rad = math.radians(a_angle)
-                    meas_circuit.ry(-a_rad, alice_qubit)
-                    
-                    # Rotate Bob's qubit
-                    b_rad = math.radians(b_angle)
-                    meas_circuit.ry(-b_rad, bob_qubit)
-                    
-                    # Measure
-                    meas_circuit.measure(alice_qubit, alice_qubit)
-                    meas_circuit.measure(bob_qubit, bob_qubit)
-                
-                # Setup noise model if specified
-                backend = self.simulator
-                if self.noise_level > 0:
-                    noise_model = NoiseModel()
-                    error = depolarizing_error(self.noise_level, 1)
-                    noise_model.add_all_qubit_quantum_error(error, ['h', 'ry'])
-                    job = backend.run(meas_circuit, shots=shots, noise_model=noise_model)
-                else:
-                    job = backend.run(meas_circuit, shots=shots)
-                
-                result = job.result()
-                counts = result.get_counts()
-                
-                # Calculate correlation for this angle pair
-                corr = self._calculate_correlation(counts, self.n_pairs)
-                correlations[key] = {
-                    "alice_angle": a_angle,
-                    "bob_angle": b_angle,
-                    "correlation": corr,
-                    "counts": counts,
-                    "shots": shots
-                }
-        
+
+        # Attach the pre-compiled measurement layer once; each angle pair
+        # only binds its two parameters instead of rebuilding the circuit
+        layer, theta_a, theta_b = _measurement_layer(self.n_pairs)
+        template = circuit.compose(layer)
+
+        backend = self.simulator
+        run_options = {"shots": shots}
+        if self.noise_level > 0:
+            run_options["noise_model"] = _noise_model(self.noise_level)
+
+        angle_pairs = [(a, b) for a in alice_angles for b in bob_angles]
+        circuits = [
+            template.assign_parameters({
+                theta_a: math.radians(a_angle),
+                theta_b: math.radians(b_angle),
+            })
+            for a_angle, b_angle in angle_pairs
+        ]
+
+        # One run for every angle pair lets Aer execute the experiments
+        # in parallel instead of dispatching a job per pair
+        result = backend.run(circuits, max_parallel_experiments=0, **run_options).result()
+
+        for i, (a_angle, b_angle) in enumerate(angle_pairs):
+            counts = result.get_counts(i)
+
+            # Calculate correlation for this angle pair
+            corr = self._calculate_correlation(counts, self.n_pairs)
+            correlations[f"({a_angle},{b_angle})"] = {
+                "alice_angle": a_angle,
+                "bob_angle": b_angle,
+                "correlation": corr,
+                "counts": counts,
+                "shots": shots
+            }
+
         return correlations
     
     def _calculate_correlation(self, counts: Dict, n_pairs: int) -> float:
@@ -157,31 +212,32 @@ class EntanglementGenerator:
         E = P(same) - P(different)
         where same means both qubits measured same value.
         """
-        same = 0
-        different = 0
-        total = sum(counts.values())
+        if not counts:
+            return 0.0
         
-        for bitstring, count in counts.items():
-            # Count same vs different for each pair
-            for i in range(n_pairs):
-                alice_idx = 2 * i
-                bob_idx = 2 * i + 1
-                
-                if alice_idx < len(bitstring) and bob_idx < len(bitstring):
-                    # Remember: Qiskit uses little-endian
-                    a_bit = int(bitstring[-(alice_idx+1)])
-                    b_bit = int(bitstring[-(bob_idx+1)])
-                    
-                    if a_bit == b_bit:
-                        same += count
-                    else:
-                        different += count
+        bits, weights = _counts_bits(counts)
+        
+        # Pairs beyond the bitstring width are not counted
+        n_measured = min(n_pairs, bits.shape[1] // 2)
+        if _kernels.NUMBA_AVAILABLE:
+            same_minus_different = int(
+                _kernels.same_minus_different(bits, weights, n_measured)
+            )
+        else:
+            # Qiskit bitstrings are little-endian: reverse them to put
+            # classical bit j in column j. Alice holds the even bits,
+            # Bob the odd ones
+            bits = bits[:, ::-1]
+            alice = bits[:, 0:2 * n_measured:2]
+            bob = bits[:, 1:2 * n_measured:2]
+            different_per_row = (alice != bob).sum(axis=1)
+            same_minus_different = int(weights @ (n_measured - 2 * different_per_row))
         
-        total_measurements = total * n_pairs
+        total_measurements = int(weights.sum()) * n_pairs
         if total_measurements == 0:
             return 0.0
         
-        correlation = (same - different) / total_measurements
+        correlation = same_minus_different / total_measurements
         return round(correlation, 4)
     
     def extract_keys(
@@ -202,46 +258,36 @@ class EntanglementGenerator:
         alice_key = []
         bob_key = []
         
-        # Find matching angle measurements
+        # Find matching angle measurements; only same-angle pairs are
+        # used for key generation, so other keys are never formatted
         for a_angle in alice_angles:
             for b_angle in bob_angles:
-                key = f"({a_angle},{b_angle})"
-                
-                if key in correlations and a_angle == b_angle:
-                    # Same angle - use for key generation
-                    data = correlations[key]
+                if a_angle != b_angle:
+                    continue
+                data = correlations.get(f"({a_angle},{b_angle})")
+                if data is not None:
                     counts = data.get("counts", {})
                     
-                    # Extract bits from most common outcomes
-                    for bitstring, count in counts.items():
-                        for i in range(self.n_pairs):
-                            if len(bitstring) > 2 * i + 1:
-                                alice_key.append(int(bitstring[-(2*i+1)]))
-                                bob_key.append(int(bitstring[-(2*i+2)]))
+                    if not counts:
+                        continue
+                    
+                    # One key bit per pair from each distinct outcome, in
+                    # outcome then pair order. Qiskit bitstrings are
+                    # little-endian, so classical bit j is column -(j+1)
+                    bits, _ = _counts_bits(counts)
+                    bits = bits[:, ::-1]
+                    n_measured = min(self.n_pairs, bits.shape[1] // 2)
+                    alice_key.extend(bits[:, 0:2 * n_measured:2].ravel().tolist())
+                    bob_key.extend(bits[:, 1:2 * n_measured:2].ravel().tolist())
         
         return alice_key, bob_key
     
-    def _circuit_to_json(self, circuit: Any) -> Dict:
+    def _circuit_to_json(self) -> Dict:
         """Convert circuit to JSON for visualization."""
-        gates = []
-        
-        for i in range(self.n_pairs):
-            alice_qubit = 2 * i
-            bob_qubit = 2 * i + 1
-            
-            gates.append({
-                "type": "H",
-                "targets": [alice_qubit],
-                "section": "entanglement",
-                "label": "Bell state"
-            })
-            gates.append({
-                "type": "CNOT",
-                "targets": [alice_qubit, bob_qubit],
-                "section": "entanglement",
-                "label": "Entangle"
-            })
-        
+        gates = [
+            {"type": gate_type, "targets": list(targets), "section": "entanglement", "label": label}
+            for gate_type, targets, label in _bell_gates(self.n_pairs)
+        ]
         gates.append({
             "type": "BARRIER",
             "targets": list(range(self.n_pairs * 2)),
@@ -252,7 +298,8 @@ class EntanglementGenerator:
             "n_qubits": self.n_pairs * 2,
             "n_classical": self.n_pairs * 2,
             "gates": gates,
-            "depth": circuit.depth() if QISKIT_AVAILABLE else 3,
+            # Every pair is H then CNOT in parallel, so depth is constant
+            "depth": 2,
             "metadata": {
                 "protocol": "E91",
                 "n_pairs": self.n_pairs,
@@ -276,24 +323,24 @@ class EntanglementGenerator:
         bob_angles: List[float]
     ) -> Dict:
         """Generate mock correlations for testing."""
+        # Quantum correlation formula: -cos(θ_a - θ_b), for every angle
+        # pair at once, with some randomness added
+        angle_diff = (
+            np.deg2rad(np.asarray(alice_angles, dtype=np.float64))[:, None]
+            - np.deg2rad(np.asarray(bob_angles, dtype=np.float64))[None, :]
+        )
+        expected_corr = -np.cos(angle_diff)
+        noise = np.random.default_rng().uniform(-0.1, 0.1, expected_corr.shape)
+        corr = np.clip(expected_corr + noise, -1, 1).round(4).tolist()
+        
         correlations = {}
         
-        for a_angle in alice_angles:
-            for b_angle in bob_angles:
-                key = f"({a_angle},{b_angle})"
-                
-                # Quantum correlation formula: -cos(θ_a - θ_b)
-                angle_diff = math.radians(a_angle - b_angle)
-                expected_corr = -math.cos(angle_diff)
-                
-                # Add some randomness
-                noise = random.uniform(-0.1, 0.1)
-                corr = max(-1, min(1, expected_corr + noise))
-                
-                correlations[key] = {
+        for i, a_angle in enumerate(alice_angles):
+            for j, b_angle in enumerate(bob_angles):
+                correlations[f"({a_angle},{b_angle})"] = {
                     "alice_angle": a_angle,
                     "bob_angle": b_angle,
-                    "correlation": round(corr, 4),
+                    "correlation": corr[i][j],
                     "counts": {"mock": 1024},
                     "shots": 1024
                 }
@@ -21,6 +21,10 @@ class ReverseGateHandler:
     # Phase angle for reverse operation (from paper)
     REVERSE_PHASE = 158  # degrees
     
+    # The phase is fixed, so its cosine is computed once
+    _COS_PHASE = math.cos(math.radians(REVERSE_PHASE))
+    _ABS_COS_PHASE = abs(_COS_PHASE)
+    
     def apply_reverse_gates(
         self,
         correlations: Dict,
@@ -50,8 +54,6 @@ class ReverseGateHandler:
             }
         
         # Eve detected - apply reverse gates
-        phase_rad = math.radians(self.REVERSE_PHASE)
-        
         # Calculate transformation matrix for documentation
         # U = exp(i·θ·Z) where θ = 158°
         transform = {
@@ -60,18 +62,19 @@ class ReverseGateHandler:
             "effect": "Decorrelates Eve's measurements"
         }
         
-        # Modify correlations to reflect reverse gate effect
-        modified_correlations = {}
-        for key, data in correlations.items():
-            modified = data.copy()
-            
-            # Reduce correlation (Eve's info becomes random)
-            original_corr = data.get("correlation", 0)
-            # Phase shift reduces correlation by cos(θ) factor
-            modified["correlation"] = original_corr * math.cos(phase_rad)
-            modified["reverse_gate_applied"] = True
-            
-            modified_correlations[key] = modified
+        # Modify correlations to reflect reverse gate effect: the phase
+        # shift reduces each correlation by the cos(θ) factor (Eve's info
+        # becomes random). Entries are shallow copies, so the counts
+        # payloads are shared rather than duplicated
+        factor = self._COS_PHASE
+        modified_correlations = {
+            key: {
+                **data,
+                "correlation": data.get("correlation", 0) * factor,
+                "reverse_gate_applied": True,
+            }
+            for key, data in correlations.items()
+        }
         
         return {
             "action": "reverse_gates_applied",
@@ -80,7 +83,7 @@ class ReverseGateHandler:
             "phase_applied": self.REVERSE_PHASE,
             "transform": transform,
             "modified_correlations": modified_correlations,
-            "eve_info_reduction": f"{(1 - abs(math.cos(phase_rad))) * 100:.1f}%"
+            "eve_info_reduction": f"{(1 - self._ABS_COS_PHASE) * 100:.1f}%"
         }
     
     def get_reverse_circuit(self, n_qubits: int) -> Dict:
@@ -156,8 +159,7 @@ class ReverseGateHandler:
         initial_info = max(0, 1 - (original_s / max_s))
         
         # After reverse gates, Eve's info is further reduced
-        phase_factor = abs(math.cos(math.radians(self.REVERSE_PHASE)))
-        final_info = initial_info * phase_factor
+        final_info = initial_info * self._ABS_COS_PHASE
         
         info_destroyed = initial_info - final_info
         effectiveness = (info_destroyed / initial_info * 100) if initial_info > 0 else 0
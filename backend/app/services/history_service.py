@@ -1,48 +1,171 @@
 """
 Service for persisting simulation results to the database.
 """
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import async_session
+from app.core.database import async_session, PreEncodedJSON
+from app.core.responses import ORJSON_OPTIONS
 from app.models.database import SimulationHistory
+from app.models.schemas import (
+    BB84SimulationRequest,
+    BB84SimulationResult,
+    E91SimulationRequest,
+    E91SimulationResult,
+)
+
+# Upper bound on history INSERTs in flight at once, so request bursts
+# can't exhaust the connection pool with background writes
+MAX_CONCURRENT_WRITES = 8
+
+_write_slots = asyncio.Semaphore(MAX_CONCURRENT_WRITES)
+_pending_writes: set[asyncio.Task] = set()
+
+
+def bb84_record(
+    config: BB84SimulationRequest,
+    result: BB84SimulationResult,
+    result_json: Optional[str] = None,
+) -> dict:
+    """
+    Column values for a BB84 history row.
+
+    The models are serialized straight to JSON text, so they are
+    traversed once rather than dumped to a dict and then re-encoded by
+    the JSON column. Pass result_json when the result was already
+    encoded (e.g. for the response body) to store that text as-is.
+    Otherwise the result goes through orjson, because the endpoint
+    keeps its bit fields as NumPy arrays.
+    """
+    if result_json is None:
+        result_json = orjson.dumps(dict(result), option=ORJSON_OPTIONS).decode()
+    return {
+        "protocol": "BB84",
+        "config": PreEncodedJSON(config.model_dump_json()),
+        "is_secure": result.is_secure,
+        "eve_attack": config.eve_attack,
+        "eve_detected": result.eve_detected,
+        "qber": result.qber,
+        "key_efficiency": result.key_efficiency,
+        "sifted_key_length": len(result.sifted_alice_key),
+        "execution_time_ms": result.execution_time_ms,
+        "full_result": PreEncodedJSON(result_json),
+    }
 
 
-async def save_bb84_result(config: dict, result: dict) -> str:
+def e91_record(
+    config: E91SimulationRequest,
+    result: E91SimulationResult,
+    result_json: Optional[str] = None,
+) -> dict:
+    """Column values for an E91 history row; see bb84_record."""
+    if result_json is None:
+        result_json = result.model_dump_json()
+    return {
+        "protocol": "E91",
+        "config": PreEncodedJSON(config.model_dump_json()),
+        "is_secure": result.is_secure,
+        "eve_attack": config.eve_attack,
+        "eve_detected": result.eve_detected,
+        "s_parameter": result.chsh_result.s_parameter,
+        "key_match_rate": result.key_match_rate,
+        "sifted_key_length": len(result.sifted_alice_key),
+        "execution_time_ms": result.execution_time_ms,
+        "full_result": PreEncodedJSON(result_json),
+    }
+
+
+async def _save_record(values: dict) -> str:
+    return (await save_records([values]))[0]
+
+
+async def save_bb84_result(
+    config: BB84SimulationRequest,
+    result: BB84SimulationResult,
+    result_json: Optional[str] = None,
+) -> str:
     """Save a BB84 simulation result and return its ID."""
-    record = SimulationHistory(
-        protocol="BB84",
-        config=config,
-        is_secure=result.get("is_secure", False),
-        eve_attack=config.get("eve_attack", False),
-        eve_detected=result.get("eve_detected", False),
-        qber=result.get("qber"),
-        key_efficiency=result.get("key_efficiency"),
-        sifted_key_length=len(result.get("sifted_alice_key", [])),
-        execution_time_ms=result.get("execution_time_ms", 0),
-        full_result=result,
-    )
-    async with async_session() as session:
-        session.add(record)
-        await session.commit()
-        return record.id
+    return await _save_record(bb84_record(config, result, result_json))
 
 
-async def save_e91_result(config: dict, result: dict) -> str:
+async def save_e91_result(
+    config: E91SimulationRequest,
+    result: E91SimulationResult,
+    result_json: Optional[str] = None,
+) -> str:
     """Save an E91 simulation result and return its ID."""
-    chsh = result.get("chsh_result", {})
-    record = SimulationHistory(
-        protocol="E91",
-        config=config,
-        is_secure=result.get("is_secure", False),
-        eve_attack=config.get("eve_attack", False),
-        eve_detected=result.get("eve_detected", False),
-        s_parameter=chsh.get("s_parameter") if isinstance(chsh, dict) else None,
-        key_match_rate=result.get("key_match_rate"),
-        sifted_key_length=len(result.get("sifted_alice_key", [])),
-        execution_time_ms=result.get("execution_time_ms", 0),
-        full_result=result,
+    return await _save_record(e91_record(config, result, result_json))
+
+
+async def bulk_save_history(db: AsyncSession, records: list[dict]) -> list[str]:
+    """
+    Insert many history rows (from bb84_record / e91_record) in one
+    executemany batch and a single commit. Returns the new IDs in order.
+    """
+    if not records:
+        return []
+    # One executemany needs the same columns in every row; BB84 and E91
+    # records leave each other's metric columns NULL
+    columns = set().union(*records)
+    if any(len(values) != len(columns) for values in records):
+        records = [{c: values.get(c) for c in columns} for values in records]
+    stmt = insert(SimulationHistory).returning(
+        SimulationHistory.id, sort_by_parameter_order=True
     )
+    ids = list(await db.scalars(stmt, records))
+    await db.commit()
+    return ids
+
+
+async def save_records(records: list[dict]) -> list[str]:
+    """
+    Save history rows (from bb84_record / e91_record) in a session of
+    their own with one INSERT ... RETURNING. Returns the IDs in order.
+    """
     async with async_session() as session:
-        session.add(record)
-        await session.commit()
-        return record.id
+        return await bulk_save_history(session, records)
+
+
+async def _safe_save(
+    save: Callable[..., Awaitable[str]],
+    config: BaseModel,
+    result: BaseModel,
+    result_json: Optional[str],
+) -> None:
+    """Run a save function, swallowing errors so they never surface."""
+    async with _write_slots:
+        try:
+            await save(config=config, result=result, result_json=result_json)
+        except Exception:
+            pass  # Don't fail the simulation if history save fails
+
+
+def save_in_background(
+    save: Callable[..., Awaitable[str]],
+    config: BaseModel,
+    result: BaseModel,
+    result_json: Optional[str] = None,
+) -> asyncio.Task:
+    """
+    Schedule a history save off the request's critical path.
+
+    result_json, if given, is the result's already-encoded JSON (such
+    as the response body) and is stored without encoding it again.
+    A reference to the task is kept until it finishes so it isn't
+    garbage-collected mid-write.
+    """
+    task = asyncio.create_task(_safe_save(save, config, result, result_json))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return task
+
+
+async def drain_pending_writes() -> None:
+    """Wait for all scheduled history writes (used on shutdown)."""
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
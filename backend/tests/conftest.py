@@ -1,20 +1,66 @@
 """
 Shared test fixtures for the QKD Simulator backend.
 """
+import asyncio
+import os
+import shutil
+import tempfile
+
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 
-from app.main import app
+# Point the app at a throwaway SQLite file before app.core.database
+# builds its engine, so runs never touch the developer's database
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="qkd-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TEST_DB_DIR}/test.db"
+
+from app.core.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 
+def pytest_sessionfinish(session, exitstatus):
+    """Delete the temporary database (and its WAL files)."""
+    shutil.rmtree(_TEST_DB_DIR, ignore_errors=True)
 
-@pytest.fixture
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """
+    Run async tests and fixtures on uvloop when it is installed (it
+    comes with uvicorn[standard], except on Windows). pytest-asyncio
+    versions without this hook ignore it and keep the default loop.
+    """
+    if UVLOOP_AVAILABLE:
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
+
+
+@pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client():
-    """Async HTTP client for integration tests."""
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    """
+    Async HTTP client for integration tests, shared by the session.
+
+    The transport and client are built once, and the app's lifespan
+    (schema creation, Redis, history write draining) runs once around
+    the whole session instead of being skipped. The engine's pooled
+    connections to the temporary database are closed afterwards.
+    """
+    try:
+        async with app.router.lifespan_context(app):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                yield ac
+    finally:
+        await engine.dispose()
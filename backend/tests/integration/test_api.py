@@ -2,16 +2,9 @@
 Integration tests for QKD Simulator API endpoints.
 """
 import pytest
-from httpx import AsyncClient, ASGITransport
 
-from app.main import app
-
-
-@pytest.fixture
-async def client():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+# [0, 1, 1, 0, 1, 0, 0, 1] * 16: a 128-bit key as hex
+QUANTUM_KEY_HEX = "69" * 16
 
 
 @pytest.mark.asyncio
@@ -81,12 +74,50 @@ async def test_bb84_simulate_with_eve(client):
 
 
 @pytest.mark.asyncio
-async def test_bb84_validation_error(client):
-    payload = {"n_qubits": 100}  # exceeds max 20
-    resp = await client.post("/api/v1/bb84/simulate", json=payload)
+async def test_bb84_simulate_batch(client):
+    payloads = [
+        {"n_qubits": 4, "bases": ["Z", "X"], "eve_attack": False, "shots": 100},
+        {"n_qubits": 6, "bases": ["Z", "X"], "eve_attack": True, "eve_intercept_ratio": 1.0, "shots": 50},
+    ]
+    resp = await client.post("/api/v1/bb84/simulate/batch", json=payloads)
+    assert resp.status_code == 200
+    first, second = resp.json()
+    assert len(first["alice_bits"]) == 4
+    assert first["eve_intercepted_indices"] is None
+    assert len(second["alice_bits"]) == 6
+    assert second["shots_used"] == 50
+    assert second["eve_intercepted_indices"] is not None
+
+
+@pytest.mark.asyncio
+async def test_bb84_simulate_batch_limits(client):
+    resp = await client.post("/api/v1/bb84/simulate/batch", json=[])
+    assert resp.status_code == 422
+    resp = await client.post("/api/v1/bb84/simulate/batch", json=[{}] * 17)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint,payload", [
+    ("/api/v1/bb84/simulate", {"n_qubits": 100}),  # exceeds max 20
+    ("/api/v1/e91/simulate", {"n_pairs": 50}),  # exceeds max 20
+])
+async def test_simulate_validation_error(client, endpoint, payload):
+    resp = await client.post(endpoint, json=payload)
     assert resp.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_bb84_simulation_failure(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("app.api.v1.endpoints.bb84.BB84CircuitBuilder", fail)
+    resp = await client.post("/api/v1/bb84/simulate", json={})
+    assert resp.status_code == 500
+    assert resp.json()["detail"] == "Simulation failed: boom"
+
+
 @pytest.mark.asyncio
 async def test_e91_simulate_basic(client):
     payload = {
@@ -106,18 +137,11 @@ async def test_e91_simulate_basic(client):
     assert "sifted_alice_key" in data
 
 
-@pytest.mark.asyncio
-async def test_e91_validation_error(client):
-    payload = {"n_pairs": 50}  # exceeds max 20
-    resp = await client.post("/api/v1/e91/simulate", json=payload)
-    assert resp.status_code == 422
-
-
 @pytest.mark.asyncio
 async def test_crypto_encrypt_decrypt(client):
     encrypt_payload = {
         "plaintext": "Hello Quantum World",
-        "quantum_key": [0, 1, 1, 0, 1, 0, 0, 1] * 16,  # 128 bits
+        "quantum_key_hex": QUANTUM_KEY_HEX,
         "key_size": 128,
     }
     resp = await client.post("/api/v1/crypto/encrypt", json=encrypt_payload)
@@ -129,7 +153,7 @@ async def test_crypto_encrypt_decrypt(client):
         # Now decrypt
         decrypt_payload = {
             "ciphertext": data["ciphertext"],
-            "quantum_key": encrypt_payload["quantum_key"],
+            "quantum_key_hex": QUANTUM_KEY_HEX,
             "key_size": 128,
             "iv": data["iv"],
         }
@@ -139,6 +163,37 @@ async def test_crypto_encrypt_decrypt(client):
             assert "plaintext" in ddata
 
 
+@pytest.mark.asyncio
+async def test_crypto_hex_key_matches_bit_list(client):
+    resp = await client.post("/api/v1/crypto/encrypt", json={
+        "plaintext": "Hello Quantum World",
+        "quantum_key_hex": QUANTUM_KEY_HEX,
+        "key_size": 128,
+    })
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["key_bits_used"] == 128
+
+    dresp = await client.post("/api/v1/crypto/decrypt", json={
+        "ciphertext": data["ciphertext"],
+        "quantum_key": [0, 1, 1, 0, 1, 0, 0, 1] * 16,
+        "key_size": 128,
+        "iv": data["iv"],
+    })
+    assert dresp.status_code == 200
+    assert dresp.json()["plaintext"] == "Hello Quantum World"
+
+
+@pytest.mark.asyncio
+async def test_crypto_requires_one_key(client):
+    both = {"plaintext": "x", "quantum_key": [0, 1] * 64, "quantum_key_hex": QUANTUM_KEY_HEX}
+    resp = await client.post("/api/v1/crypto/encrypt", json=both)
+    assert resp.status_code == 422
+
+    resp = await client.post("/api/v1/crypto/encrypt", json={"plaintext": "x", "quantum_key_hex": "6z"})
+    assert resp.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_history_list_empty(client):
     resp = await client.get("/api/v1/history")
@@ -149,12 +204,7 @@ async def test_history_list_empty(client):
 
 
 @pytest.mark.asyncio
-async def test_history_detail_not_found(client):
-    resp = await client.get("/api/v1/history/nonexistent-id")
-    assert resp.status_code == 404
-
-
-@pytest.mark.asyncio
-async def test_history_delete_not_found(client):
-    resp = await client.delete("/api/v1/history/nonexistent-id")
+@pytest.mark.parametrize("method", ["GET", "DELETE"])
+async def test_history_item_not_found(client, method):
+    resp = await client.request(method, "/api/v1/history/nonexistent-id")
     assert resp.status_code == 404
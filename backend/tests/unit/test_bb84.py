@@ -1,12 +1,15 @@
 """
 Unit tests for BB84 protocol modules.
 """
-import random
+import math
+
+import numpy as np
 import pytest
 
 from app.protocols.bb84.circuit_builder import BB84CircuitBuilder
 from app.protocols.bb84.key_sifting import KeySifter
-from app.protocols.bb84.eve_attack import EveAttacker
+from app.protocols.bb84.eve_attack import EveAttacker, intercept
+from app.protocols.bb84.bases import decode_bases, encode_bases
 from app.analysis.qber_calculator import QBERCalculator
 
 
@@ -29,6 +32,15 @@ class TestBB84CircuitBuilder:
         assert len(bob_bases) == 12
         assert all(b in ("Z", "X") for b in bob_bases)
 
+    def test_seeded_rng_is_reproducible(self):
+        a = BB84CircuitBuilder(n_qubits=16, bases=["Z", "X", "D"], rng=np.random.default_rng(1))
+        b = BB84CircuitBuilder(n_qubits=16, bases=["Z", "X", "D"], rng=np.random.default_rng(1))
+        bits_a, bases_a = a.generate_alice_data()
+        bits_b, bases_b = b.generate_alice_data()
+        assert bits_a.tolist() == bits_b.tolist()
+        assert bases_a == bases_b
+        assert a.generate_bob_bases() == b.generate_bob_bases()
+
     def test_build_circuit_returns_json(self):
         builder = BB84CircuitBuilder(n_qubits=4, bases=["Z", "X"])
         alice_bits = [0, 1, 0, 1]
@@ -40,6 +52,27 @@ class TestBB84CircuitBuilder:
         assert len(cj["gates"]) > 0
         assert cj["metadata"]["protocol"] == "BB84"
 
+    def test_build_circuit_tracks_depth(self):
+        builder = BB84CircuitBuilder(n_qubits=3, bases=["Z", "X", "D"])
+        circuit, cj = builder.build_circuit(
+            [1, 0, 1], ["D", "Z", "X"], ["Z", "D", "X"]
+        )
+        assert cj["depth"] == circuit.depth() == 6
+
+    def test_measure_analytic_matches_circuit(self):
+        # Z/Z and X/D pairs are deterministic; Z against X/D is random
+        alice_bits = [1, 0, 1, 1, 0, 1]
+        alice_bases = ["Z", "X", "D", "X", "D", "Z"]
+        bob_bases = ["Z", "X", "D", "D", "X", "Z"]
+        builder = BB84CircuitBuilder(n_qubits=6, bases=["Z", "X", "D"])
+        circuit, _ = builder.build_circuit(alice_bits, alice_bases, bob_bases)
+        assert builder.measure_analytic(alice_bits, alice_bases, bob_bases).tolist() == alice_bits
+        assert builder.execute(circuit, shots=64).tolist() == alice_bits
+
+        builder = BB84CircuitBuilder(n_qubits=200, bases=["Z", "X"], rng=np.random.default_rng(3))
+        bob = builder.measure_analytic([0] * 200, ["Z"] * 200, ["X"] * 200)
+        assert 0 < int(bob.sum()) < 200
+
 
 class TestKeySifting:
     def test_same_bases_all_match(self):
@@ -79,6 +112,21 @@ class TestKeySifting:
         assert result["matching_indices"] == [0, 2]
         assert result["efficiency"] == 0.5
 
+    def test_array_inputs_match_list_path(self):
+        sifter = KeySifter()
+        kwargs = dict(
+            alice_bases=["Z", "X", "D", "X", "Z"],
+            bob_measurements=[1, 0, 1, 1, 0],
+            bob_bases=["Z", "D", "D", "X", "X"],
+        )
+        expected = sifter.sift_keys(alice_bits=[1, 1, 0, 1, 0], **kwargs)
+        result = sifter.sift_keys(
+            alice_bits=np.array([1, 1, 0, 1, 0], dtype=np.uint8), **kwargs
+        )
+        assert result["alice_key"].tolist() == expected["alice_key"]
+        assert result["bob_key"].tolist() == expected["bob_key"]
+        assert result["matching_indices"].tolist() == expected["matching_indices"] == [0, 2, 3]
+
     def test_compare_keys_match(self):
         sifter = KeySifter()
         result = sifter.compare_keys([0, 1, 0], [0, 1, 0])
@@ -100,13 +148,13 @@ class TestKeySifting:
 
 class TestEveAttacker:
     def test_intercept_modifies_measurements(self):
-        random.seed(42)
         attacker = EveAttacker(n_qubits=8, intercept_ratio=1.0, bases=["Z", "X"])
         result = attacker.intercept(
             alice_bits=[0, 1, 0, 1, 0, 1, 0, 1],
             alice_bases=["Z", "X", "Z", "X", "Z", "X", "Z", "X"],
             bob_bases=["Z", "X", "Z", "X", "Z", "X", "Z", "X"],
             bob_measurements=[0, 1, 0, 1, 0, 1, 0, 1],
+            rng=np.random.default_rng(42),
         )
         assert "intercepted_indices" in result
         assert len(result["intercepted_indices"]) == 8  # 100% intercept
@@ -125,15 +173,57 @@ class TestEveAttacker:
         assert len(result["intercepted_indices"]) == 0
         assert result["modified_bob_measurements"] == [0, 1, 0, 1]
 
+    def test_intercept_seeded_rng_is_reproducible(self):
+        kwargs = dict(
+            alice_bits=[0, 1, 0, 1, 0, 1],
+            alice_bases=["Z", "X", "Z", "X", "Z", "X"],
+            bob_bases=["Z", "Z", "X", "X", "Z", "X"],
+            bob_measurements=[0, 1, 0, 1, 0, 1],
+            intercept_ratio=0.5,
+        )
+        first = intercept(np.random.default_rng(7), **kwargs)
+        second = intercept(np.random.default_rng(7), **kwargs)
+        assert first == second
+        assert len(first["intercepted_indices"]) == 3
+
+    def test_intercept_updates_uint8_array_in_place(self):
+        bob = np.array([0, 1, 0, 1, 0, 1, 0, 1], dtype=np.uint8)
+        result = intercept(
+            np.random.default_rng(3),
+            alice_bits=[0, 1, 0, 1, 0, 1, 0, 1],
+            alice_bases=["Z", "X"] * 4,
+            bob_bases=["X", "Z"] * 4,
+            bob_measurements=bob,
+        )
+        assert result["modified_bob_measurements"] is bob
+
+    def test_intercept_accepts_basis_codes(self):
+        alice_bases = ["Z", "X", "D", "X", "Z", "D"]
+        bob_bases = ["Z", "Z", "X", "X", "D", "D"]
+        kwargs = dict(
+            alice_bits=[0, 1, 0, 1, 0, 1],
+            bob_measurements=[0, 1, 0, 1, 0, 1],
+            bases=["Z", "X", "D"],
+        )
+        labels = intercept(np.random.default_rng(5), alice_bases=alice_bases, bob_bases=bob_bases, **kwargs)
+        codes = intercept(
+            np.random.default_rng(5),
+            alice_bases=encode_bases(alice_bases),
+            bob_bases=encode_bases(bob_bases),
+            **kwargs,
+        )
+        assert labels == codes
+        assert decode_bases(encode_bases(alice_bases)) == alice_bases
+
     def test_calculate_expected_error_two_bases(self):
         attacker = EveAttacker(n_qubits=9, intercept_ratio=1.0, bases=["Z", "X"])
         error = attacker.calculate_expected_error(["Z"] * 9)
-        assert error == pytest.approx(25.0, abs=0.1)
+        assert math.isclose(error, 25.0, abs_tol=0.1)
 
     def test_calculate_expected_error_three_bases(self):
         attacker = EveAttacker(n_qubits=9, intercept_ratio=1.0, bases=["Z", "X", "D"])
         error = attacker.calculate_expected_error(["Z"] * 9)
-        assert error == pytest.approx(33.33, abs=0.1)
+        assert math.isclose(error, 33.33, abs_tol=0.1)
 
 
 class TestQBERCalculator:
@@ -150,6 +240,14 @@ class TestQBERCalculator:
         assert result["qber"] == 50.0
         assert result["is_secure"] is False
 
+    def test_mismatch_count_unaligned_length(self):
+        calc = QBERCalculator()
+        alice = [0, 1] * 10 + [1]
+        bob = [0, 1] * 10 + [0]
+        result = calc.calculate(alice, bob)
+        assert result["mismatched_bits"] == 1
+        assert result["total_bits"] == 21
+
     def test_threshold_boundary(self):
         calc = QBERCalculator()
         assert calc.SECURITY_THRESHOLD == 8.5
@@ -175,6 +273,20 @@ class TestQBERCalculator:
         rec = calc.get_security_recommendation(2.0)
         assert rec["status"] == "excellent"
 
+    def test_security_recommendation_band_edges(self):
+        calc = QBERCalculator()
+        assert calc.get_security_recommendation(5.0)["status"] == "excellent"
+        assert calc.get_security_recommendation(8.5)["status"] == "acceptable"
+        assert calc.get_security_recommendation(15.0)["status"] == "warning"
+        assert calc.get_security_recommendation(15.01)["status"] == "critical"
+
+    def test_security_recommendation_is_read_only(self):
+        calc = QBERCalculator()
+        rec = calc.get_security_recommendation(2.0)
+        with pytest.raises(TypeError):
+            rec["status"] = "critical"
+        assert calc.get_security_recommendation(2.0)["status"] == "excellent"
+
     def test_security_recommendation_critical(self):
         calc = QBERCalculator()
         rec = calc.get_security_recommendation(20.0)
@@ -185,6 +297,16 @@ class TestQBERCalculator:
         length = calc.estimate_secure_key_length(100, 0.0)
         assert length == 100
 
+    def test_estimate_secure_key_length_partial(self):
+        calc = QBERCalculator()
+        # h(0.05) ~= 0.2864 -> efficiency ~= 0.427
+        length = calc.estimate_secure_key_length(100, 5.0)
+        assert length == 42
+
+    def test_estimate_secure_key_length_empty_key(self):
+        calc = QBERCalculator()
+        assert calc.estimate_secure_key_length(0, 5.0) == 0
+
     def test_estimate_secure_key_length_above_threshold(self):
         calc = QBERCalculator()
         length = calc.estimate_secure_key_length(100, 10.0)
@@ -0,0 +1,17 @@
+"""
+Unit tests for the crypto module.
+"""
+import numpy as np
+
+from app.crypto.aes_encryption import PrivacyAmplification
+
+
+class TestPrivacyAmplification:
+    def test_secure_lengths_match_scalar(self):
+        qbers = np.array([0.0, 0.01, 0.05, 0.1, 0.11, 0.5])
+        raw = np.array([100, 1000, 1000, 1000, 1000, 1000])
+        expected = [
+            PrivacyAmplification.calculate_secure_length(int(n), float(q))
+            for n, q in zip(raw, qbers)
+        ]
+        assert PrivacyAmplification.calculate_secure_lengths(raw, qbers).tolist() == expected
@@ -15,18 +15,28 @@ class TestCHSHValidator:
 
     def test_quantum_max(self):
         validator = CHSHValidator()
-        assert validator.QUANTUM_MAX == pytest.approx(2.828, abs=0.001)
+        assert math.isclose(validator.QUANTUM_MAX, 2.828, abs_tol=0.001)
 
     def test_theoretical_s_optimal_angles(self):
         validator = CHSHValidator()
         s = validator.get_theoretical_s([0, 45], [22.5, 67.5])
-        assert s == pytest.approx(2.8284, abs=0.01)
+        assert math.isclose(s, 2.8284, abs_tol=0.01)
 
     def test_theoretical_s_suboptimal_angles(self):
         validator = CHSHValidator()
         s = validator.get_theoretical_s([0, 90], [45, 135])
         # S should be exactly 2.0 for these angles
-        assert s == pytest.approx(2.0, abs=0.01)
+        assert math.isclose(s, 2.0, abs_tol=0.01)
+
+    def test_theoretical_s_batch_matches_scalar(self):
+        validator = CHSHValidator()
+        alice_pairs = [[0, 45], [0, 90]]
+        bob_pairs = [[22.5, 67.5], [45, 135], [30, 60]]
+        batch = validator.get_theoretical_s_batch(alice_pairs, bob_pairs)
+        assert batch.shape == (2, 3)
+        for i, a in enumerate(alice_pairs):
+            for j, b in enumerate(bob_pairs):
+                assert round(float(batch[i, j]), 4) == validator.get_theoretical_s(a, b)
 
     def test_calculate_chsh_with_correlations(self):
         validator = CHSHValidator()
@@ -60,6 +70,13 @@ class TestCHSHValidator:
         result = validator.interpret_result(2.1)
         assert result["status"] == "marginal"
 
+    def test_interpret_result_is_read_only(self):
+        validator = CHSHValidator()
+        result = validator.interpret_result(2.7)
+        with pytest.raises(TypeError):
+            result["status"] = "insecure"
+        assert validator.interpret_result(2.7)["status"] == "secure"
+
     def test_interpret_insecure(self):
         validator = CHSHValidator()
         result = validator.interpret_result(1.2)
@@ -98,3 +115,16 @@ class TestEntanglementGenerator:
         for key, data in corr.items():
             assert "correlation" in data
             assert -1.0 <= data["correlation"] <= 1.0
+
+    def test_matching_angles_fully_correlated(self):
+        gen = EntanglementGenerator(n_pairs=2)
+        circuit, _ = gen.create_bell_pairs()
+        corr = gen.measure_correlations(circuit, [0.0, 45.0], [0.0, 45.0], shots=64)
+        assert corr["(0.0,0.0)"]["correlation"] == 1.0
+        assert corr["(45.0,45.0)"]["correlation"] == 1.0
+
+    def test_calculate_correlation_from_counts(self):
+        gen = EntanglementGenerator(n_pairs=2)
+        # "0110": classical bits c0..c3 = 0,1,1,0, so both pairs disagree
+        corr = gen._calculate_correlation({"0000": 3, "0110": 1}, n_pairs=2)
+        assert corr == 0.5
@@ -0,0 +1,116 @@
+"""
+Unit tests for the history persistence service.
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.database import SimulationHistory
+from app.models.schemas import (
+    BB84SimulationRequest,
+    BB84SimulationResult,
+    CHSHResult,
+    E91SimulationRequest,
+    E91SimulationResult,
+)
+from app.services.history_service import bb84_record, bulk_save_history, e91_record
+
+
+def _bb84_result(qber: float) -> BB84SimulationResult:
+    return BB84SimulationResult(
+        circuit_json={"n_qubits": 2, "gates": [], "depth": 1},
+        circuit_depth=1,
+        alice_bits=[0, 1],
+        alice_bases=["Z", "X"],
+        bob_bases=["Z", "Z"],
+        bob_measurements=[0, 1],
+        sifted_alice_key=[0],
+        sifted_bob_key=[0],
+        matching_indices=[0],
+        eve_detected=False,
+        qber=qber,
+        is_secure=True,
+        information_leakage=0.0,
+        key_efficiency=0.5,
+        execution_time_ms=1.0,
+        shots_used=16,
+    )
+
+
+def _e91_result() -> E91SimulationResult:
+    return E91SimulationResult(
+        circuit_json={"n_qubits": 2, "gates": [], "depth": 2},
+        circuit_depth=2,
+        alice_angles_used=[0.0, 45.0],
+        bob_angles_used=[45.0, 90.0],
+        correlations={},
+        chsh_result=CHSHResult(
+            s_parameter=2.5,
+            classical_bound=2.0,
+            quantum_max=2.828,
+            violates_classical=True,
+            expectation_values={},
+        ),
+        is_secure=True,
+        eve_detected=False,
+        sifted_alice_key=[0, 1],
+        sifted_bob_key=[0, 1],
+        key_match_rate=100.0,
+        execution_time_ms=1.0,
+        shots_per_combination=16,
+    )
+
+
+async def _memory_session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+class TestRecords:
+    def test_reuses_encoded_result(self):
+        record = bb84_record(
+            BB84SimulationRequest(n_qubits=2), _bb84_result(1.0), result_json='{"qber":1.0}'
+        )
+        assert record["full_result"] == '{"qber":1.0}'
+
+
+class TestBulkSaveHistory:
+    async def test_returns_ids_in_insert_order(self):
+        engine, session_factory = await _memory_session_factory()
+
+        config = BB84SimulationRequest(n_qubits=2)
+        records = [bb84_record(config, _bb84_result(qber)) for qber in (1.0, 2.0)]
+        async with session_factory() as db:
+            ids = await bulk_save_history(db, records)
+            rows = (await db.execute(
+                select(SimulationHistory.id, SimulationHistory.qber)
+            )).all()
+        await engine.dispose()
+
+        assert len(ids) == 2
+        assert dict(rows) == {ids[0]: 1.0, ids[1]: 2.0}
+
+    async def test_empty_batch(self):
+        assert await bulk_save_history(None, []) == []
+
+    async def test_mixed_protocols(self):
+        engine, session_factory = await _memory_session_factory()
+
+        records = [
+            bb84_record(BB84SimulationRequest(n_qubits=2), _bb84_result(1.0)),
+            e91_record(E91SimulationRequest(n_pairs=2), _e91_result()),
+        ]
+        async with session_factory() as db:
+            ids = await bulk_save_history(db, records)
+            rows = (await db.execute(
+                select(SimulationHistory.id, SimulationHistory.qber, SimulationHistory.s_parameter)
+            )).all()
+        await engine.dispose()
+
+        assert {row.id: (row.qber, row.s_parameter) for row in rows} == {
+            ids[0]: (1.0, None),
+            ids[1]: (None, 2.5),
+        }
+
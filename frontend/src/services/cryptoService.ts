@@ -4,7 +4,9 @@
 import api from './api';
 
 export interface EncryptRequest {
-    quantum_key: number[];
+    // Exactly one of quantum_key (bits) or quantum_key_hex
+    quantum_key?: number[];
+    quantum_key_hex?: string;
     plaintext: string;
     key_size?: number;
 }
@@ -21,7 +23,9 @@ export interface EncryptResponse {
 }
 
 export interface DecryptRequest {
-    quantum_key: number[];
+    // Exactly one of quantum_key (bits) or quantum_key_hex
+    quantum_key?: number[];
+    quantum_key_hex?: string;
     ciphertext: string;
     iv: string;
     key_size?: number;